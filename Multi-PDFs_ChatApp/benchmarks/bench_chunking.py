@@ -0,0 +1,106 @@
+"""Context tokens per answer, retrieval latency and index size across chunk settings.
+
+Indexes the PDFs once per setting (offline, with the hashing embeddings) and runs the
+same sampled questions against each index. ``chars-50000-1000`` is the former
+character splitter; the others are ``TokenChunker`` budgets. Run from
+``Multi-PDFs_ChatApp/``::
+
+    python benchmarks/bench_chunking.py [--docs docs] [--settings 256:32,512:64,1024:128] [--k 4]
+"""
+import argparse
+import glob
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter  # noqa: E402
+
+from pdfchat.chunking import TokenChunker, count_tokens  # noqa: E402
+from pdfchat.embeddings import HashingEmbeddings  # noqa: E402
+from pdfchat.extraction import iter_pdf_pages  # noqa: E402
+from pdfchat.indexing import load_vector_store, sync_index  # noqa: E402
+
+
+class CharacterChunker:
+    """The previous chunking: one document's text split every 50,000 characters."""
+
+    name = "chars-50000-1000"
+
+    def __init__(self):
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=50000, chunk_overlap=1000)
+
+    def __call__(self, pages):
+        text = "\n".join(text for _, text in pages)
+        return [(chunk, {"pages": [pages[0][0], pages[-1][0]]}) for chunk in self.splitter.split_text(text)]
+
+
+def sample_queries(paths, count, seed):
+    """The same questions for every setting: a few consecutive words from random pages."""
+    rng = random.Random(seed)
+    pages = [text for _, _, text in iter_pdf_pages(paths) if len(text.split()) > 20]
+    queries = []
+    for _ in range(count):
+        words = rng.choice(pages).split()
+        start = rng.randrange(len(words) - 12)
+        queries.append(" ".join(words[start:start + 12]))
+    return queries
+
+
+def run(paths, chunker, queries, k):
+    embeddings = HashingEmbeddings()
+    index_dir = tempfile.mkdtemp(prefix="pdfchat-bench-")
+    try:
+        stats = sync_index(paths, embeddings, chunker, index_dir=index_dir)
+        size = sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir))
+        store = load_vector_store(index_dir, embeddings)
+        latencies, context = [], []
+        for query in queries:
+            start = time.perf_counter()
+            docs = store.similarity_search(query, k=k)
+            latencies.append(time.perf_counter() - start)
+            context.append(sum(count_tokens(doc.page_content) for doc in docs))
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+    latencies.sort()
+    return {
+        "chunks": stats["embedded_chunks"],
+        "context": statistics.mean(context),
+        "p50": 1000 * statistics.median(latencies),
+        "p99": 1000 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "size": size / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", default=os.path.join(os.path.dirname(__file__), "..", "docs"))
+    parser.add_argument("--settings", default="256:32,512:64,1024:128",
+                        help="comma-separated max_tokens:overlap pairs")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.docs, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.docs}")
+    queries = sample_queries(paths, args.queries, args.seed)
+    chunkers = [CharacterChunker()] + [
+        TokenChunker(*(int(v) for v in setting.split(":"))) for setting in args.settings.split(",")
+    ]
+    print(f"{len(paths)} PDFs, {len(queries)} questions, k={args.k}")
+    print(f"{'setting':<28} {'chunks':>7} {'ctx tokens':>11} {'p50 ms':>8} {'p99 ms':>8} {'index KB':>9}")
+    for chunker in chunkers:
+        r = run(paths, chunker, queries, args.k)
+        print(f"{chunker.name:<28} {r['chunks']:>7} {r['context']:>11.0f} {r['p50']:>8.2f} "
+              f"{r['p99']:>8.2f} {r['size']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Offline ingestion and query benchmark for an embeddings backend.
+
+Indexes the PDFs into a throwaway directory with ``sync_index`` and then times
+similarity searches. With the default ``hashing`` backend nothing touches the network
+and every run produces the same index, so the printed result digest only changes when
+the ingestion or retrieval code does. Run from ``Multi-PDFs_ChatApp/``::
+
+    python benchmarks/bench_embeddings.py [--backend hashing] [--docs docs] [--queries 200]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pdfchat import config  # noqa: E402
+from pdfchat.chunking import TokenChunker  # noqa: E402
+from pdfchat.embeddings import BACKENDS, make_embeddings  # noqa: E402
+from pdfchat.indexing import load_vector_store, sync_index  # noqa: E402
+
+
+def sample_queries(store, count, seed):
+    """Deterministic questions: a few consecutive words taken from random indexed chunks."""
+    rng = random.Random(seed)
+    texts = sorted(doc.page_content for doc in store.docstore._dict.values())
+    queries = []
+    for _ in range(count):
+        words = rng.choice(texts).split()
+        start = rng.randrange(max(1, len(words) - 12))
+        queries.append(" ".join(words[start:start + 12]))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=BACKENDS, default="hashing")
+    parser.add_argument("--docs", default=os.path.join(os.path.dirname(__file__), "..", "docs"))
+    parser.add_argument("--chunk-tokens", type=int, default=config.CHUNK_TOKENS)
+    parser.add_argument("--chunk-overlap", type=int, default=config.CHUNK_OVERLAP)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.docs, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.docs}")
+    chunker = TokenChunker(max_tokens=args.chunk_tokens, overlap=args.chunk_overlap)
+    embeddings = make_embeddings(args.backend)
+    index_dir = tempfile.mkdtemp(prefix="pdfchat-bench-")
+    try:
+        start = time.perf_counter()
+        stats = sync_index(paths, embeddings, chunker, index_dir=index_dir)
+        ingest = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir))
+
+        store = load_vector_store(index_dir, embeddings)
+        queries = sample_queries(store, args.queries, args.seed)
+        latencies, digest = [], hashlib.sha256()
+        for query in queries:
+            start = time.perf_counter()
+            docs = store.similarity_search(query, k=args.k)
+            latencies.append(time.perf_counter() - start)
+            for doc in docs:
+                digest.update(doc.page_content[:64].encode("utf-8"))
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+    latencies.sort()
+    print(f"backend: {embeddings.model}")
+    print(f"ingest: {len(paths)} PDFs, {stats['embedded_chunks']} chunks in {ingest:.2f}s "
+          f"({stats['embedded_chunks'] / ingest:.1f} chunks/s), index {size / 1024:.0f} KB")
+    print(f"query:  {len(queries)} searches, p50 {1000 * statistics.median(latencies):.2f} ms, "
+          f"p99 {1000 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]:.2f} ms")
+    print(f"result digest: {digest.hexdigest()[:16]}")
+
+
+if __name__ == "__main__":
+    main()
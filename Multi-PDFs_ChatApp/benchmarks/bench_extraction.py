@@ -0,0 +1,49 @@
+"""Pages/second of PDF text extraction: serial vs. the process pool.
+
+Run from ``Multi-PDFs_ChatApp/``::
+
+    python benchmarks/bench_extraction.py [--docs docs] [--workers 4] [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pdfchat.extraction import iter_pdf_pages  # noqa: E402
+
+
+def run(paths, workers):
+    start = time.perf_counter()
+    first = None
+    pages = chars = 0
+    for _, _, text in iter_pdf_pages(paths, max_workers=workers):
+        if first is None:
+            first = time.perf_counter() - start
+        pages += 1
+        chars += len(text)
+    return pages, chars, time.perf_counter() - start, first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", default=os.path.join(os.path.dirname(__file__), "..", "docs"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.docs, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.docs}")
+    print(f"{len(paths)} PDFs from {os.path.abspath(args.docs)}")
+    print(f"{'mode':<12} {'pages':>6} {'seconds':>9} {'pages/s':>9} {'first page s':>13}")
+    for label, workers in (("serial", 1), (f"pool x{args.workers}", args.workers)):
+        best = min((run(paths, workers) for _ in range(args.repeat)), key=lambda r: r[2])
+        pages, _, seconds, first = best
+        print(f"{label:<12} {pages:>6} {seconds:>9.2f} {pages / seconds:>9.1f} {first:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
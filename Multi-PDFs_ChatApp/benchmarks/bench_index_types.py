@@ -0,0 +1,125 @@
+"""Recall@k, build time, memory and query latency of each FAISS index type.
+
+Builds every type from ``pdfchat.vectorindex`` over the same synthetic clustered
+vectors (a stand-in for a large chunk corpus) and scores it against exact search with
+the flat index. Each saved index is then loaded in a fresh process, read into memory
+and memory-mapped, to measure the private (unshareable) memory it adds after all
+queries and p50/p99 latency per query. Run from ``Multi-PDFs_ChatApp/``::
+
+    python benchmarks/bench_index_types.py [--vectors 20000] [--dim 768] [--queries 500] [--k 10]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pdfchat.vectorindex import INDEX_TYPES, new_index, read_index, tune  # noqa: E402
+
+
+def clustered_vectors(count, dim, seed, clusters=200, latent=48):
+    """Unit vectors around topic centres in a low-dimensional subspace, like text embeddings."""
+    basis = np.random.default_rng(0).normal(size=(latent, dim)).astype(np.float32)
+    centres = np.random.default_rng(1).normal(size=(clusters, latent)).astype(np.float32)
+    rng = np.random.default_rng(seed)
+    points = centres[rng.integers(clusters, size=count)] + 0.5 * rng.normal(size=(count, latent))
+    vectors = points.astype(np.float32) @ basis + 0.05 * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def private_mb():
+    """Anonymous (unshareable) resident memory; file-backed mmap pages are not counted."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import psutil
+
+    return psutil.Process().memory_info().rss / 2 ** 20
+
+
+def measure(path, kind, mmap, queries_path, truth_path, k):
+    """Runs in a child process: private memory added by the index, latency and recall@k."""
+    queries, truth = np.load(queries_path), np.load(truth_path)
+    before = private_mb()
+    index = read_index(path, mmap=mmap)
+    tune(index, kind)
+    latencies, found = [], []
+    for query in queries:
+        start = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        found.append(ids[0])
+    latencies.sort()
+    recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)])
+    return {
+        "private_mb": private_mb() - before,
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p99_ms": 1000 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "recall": float(recall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--types", default=",".join(INDEX_TYPES))
+    parser.add_argument("--child", nargs=3, metavar=("INDEX", "TYPE", "MMAP"), help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        path, kind, mmap = args.child
+        result = measure(path, kind, mmap == "1", os.path.join(args.workdir, "queries.npy"),
+                         os.path.join(args.workdir, "truth.npy"), args.k)
+        print(json.dumps(result))
+        return
+
+    import faiss
+
+    vectors = clustered_vectors(args.vectors, args.dim, seed=0)
+    queries = clustered_vectors(args.queries, args.dim, seed=1)
+    workdir = tempfile.mkdtemp(prefix="pdfchat-bench-")
+    try:
+        exact = faiss.IndexFlatL2(args.dim)
+        exact.add(vectors)
+        np.save(os.path.join(workdir, "queries.npy"), queries)
+        np.save(os.path.join(workdir, "truth.npy"), exact.search(queries, args.k)[1])
+        print(f"{args.vectors} x {args.dim} vectors, {args.queries} queries, recall@{args.k} vs. flat")
+        print(f"{'type':<6} {'build s':>8} {'file MB':>8} {'load':<6} {'priv MB':>7} {'p50 ms':>7} {'p99 ms':>7} {'recall':>7}")
+        for kind in args.types.split(","):
+            start = time.perf_counter()
+            index, built = new_index(kind, vectors)
+            index.add(vectors)
+            build = time.perf_counter() - start
+            path = os.path.join(workdir, f"{kind}.faiss")
+            faiss.write_index(index, path)
+            del index
+            for mmap in ("0", "1"):
+                out = subprocess.run(
+                    [sys.executable, __file__, "--child", path, built, mmap, "--workdir", workdir, "--k", str(args.k)],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                r = json.loads(out.strip().splitlines()[-1])
+                print(f"{built:<6} {build:>8.2f} {os.path.getsize(path) / 2 ** 20:>8.1f} "
+                      f"{'mmap' if mmap == '1' else 'read':<6} {r['private_mb']:>7.1f} {r['p50_ms']:>7.2f} "
+                      f"{r['p99_ms']:>7.2f} {r['recall']:>7.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
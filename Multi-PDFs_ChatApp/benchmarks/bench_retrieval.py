@@ -0,0 +1,122 @@
+"""Vector-only vs. hybrid (BM25 + vector, RRF) retrieval on the ``docs/`` corpus.
+
+Indexes the PDFs offline with the hashing embeddings, then asks two kinds of
+questions whose source chunk is known: *phrase* questions (a dozen consecutive words of
+a chunk) and *keyword* questions (an acronym or model name that occurs in few chunks).
+Reports BM25 build time, hit@k, p50/p99 latency and how many questions had to be
+embedded. ``--embed-ms`` adds a simulated per-call embedding round trip, as with a
+hosted embeddings API. Run from ``Multi-PDFs_ChatApp/``::
+
+    python benchmarks/bench_retrieval.py [--docs docs] [--queries 200] [--k 4] [--embed-ms 0]
+"""
+import argparse
+import glob
+import os
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pdfchat import config  # noqa: E402
+from pdfchat.chunking import TokenChunker  # noqa: E402
+from pdfchat.embeddings import HashingEmbeddings  # noqa: E402
+from pdfchat.indexing import load_vector_store, sync_index  # noqa: E402
+from pdfchat.retrieval import HybridRetriever, tokenize  # noqa: E402
+
+ACRONYM_RE = re.compile(r"\b[A-Z][A-Za-z]*[A-Z0-9][A-Za-z0-9-]*\b")
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """Hashing embeddings that count query embeddings and can simulate network latency."""
+
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.queries = 0
+
+    def embed_query(self, text):
+        self.queries += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return super().embed_query(text)
+
+
+def make_questions(docs, count, seed):
+    """``(kind, question, source doc id)`` for phrase and keyword questions."""
+    rng = random.Random(seed)
+    ids = sorted(docs)
+    mentions = {}
+    for doc_id in ids:
+        for term in set(ACRONYM_RE.findall(docs[doc_id].page_content)):
+            mentions.setdefault(term, set()).add(doc_id)
+    # Names that occur (as whole tokens, any case) in a single chunk.
+    found = {}
+    for doc_id in ids:
+        for token in set(tokenize(docs[doc_id].page_content)):
+            found.setdefault(token, set()).add(doc_id)
+    rare = sorted(
+        (term, next(iter(where))) for term, where in mentions.items()
+        if len(where) == 1 and len(term) > 2 and tokenize(term) == [term.lower()] and len(found[term.lower()]) == 1
+    )
+    questions = []
+    for _ in range(count // 2):
+        doc_id = rng.choice(ids)
+        words = docs[doc_id].page_content.split()
+        start = rng.randrange(max(1, len(words) - 12))
+        questions.append(("phrase", " ".join(words[start:start + 12]), doc_id))
+    for term, doc_id in rng.sample(rare, min(len(rare), count - count // 2)):
+        questions.append(("keyword", f"What is {term}?", doc_id))
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", default=os.path.join(os.path.dirname(__file__), "..", "docs"))
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=config.RETRIEVAL_K)
+    parser.add_argument("--embed-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.docs, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.docs}")
+    embeddings = CountingEmbeddings(args.embed_ms / 1000)
+    index_dir = tempfile.mkdtemp(prefix="pdfchat-bench-")
+    try:
+        sync_index(paths, embeddings, TokenChunker(config.CHUNK_TOKENS, config.CHUNK_OVERLAP), index_dir=index_dir)
+        store = load_vector_store(index_dir, embeddings)
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+    start = time.perf_counter()
+    retriever = HybridRetriever(store, keyword_margin=config.KEYWORD_MARGIN)
+    build = time.perf_counter() - start
+    questions = make_questions(store.docstore._dict, args.queries, args.seed)
+    print(f"{len(retriever.bm25)} chunks, BM25 built in {1000 * build:.1f} ms, "
+          f"{len(questions)} questions, k={args.k}, embed round trip {args.embed_ms:.0f} ms")
+    print(f"{'mode':<8} {'questions':<9} {'hit@k':>6} {'p50 ms':>8} {'p99 ms':>8} {'embedded':>9} {'keyword-only':>13}")
+    for mode in ("vector", "hybrid"):
+        for kind in ("phrase", "keyword"):
+            subset = [q for q in questions if q[0] == kind]
+            embeddings.queries = 0
+            latencies, hits, keyword_only = [], 0, 0
+            for _, question, source in subset:
+                start = time.perf_counter()
+                docs, how = retriever.search(question, k=args.k, mode=mode)
+                latencies.append(time.perf_counter() - start)
+                hits += any(doc.page_content == store.docstore.search(source).page_content for doc in docs)
+                keyword_only += how == "keyword"
+            latencies.sort()
+            print(f"{mode:<8} {kind:<9} {hits / len(subset):>6.2f} {1000 * statistics.median(latencies):>8.2f} "
+                  f"{1000 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]:>8.2f} "
+                  f"{embeddings.queries:>9} {keyword_only:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,95 @@
 import streamlit as st
-from PyPDF2 import PdfReader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 import os
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+import time
 import google.generativeai as genai
-from langchain.vectorstores import FAISS
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains.question_answering import load_qa_chain
 from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
+from pdfchat import config
+from pdfchat.answers import answer_cache
+from pdfchat.chunking import TokenChunker
+from pdfchat.embeddings import make_embeddings
+from pdfchat.jobs import ingest_queue
+from pdfchat.namespaces import collection_path, list_collections
+from pdfchat.store import index_cache
 
 load_dotenv()
 # Configure the Google Generative AI API
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-def get_pdf_text(pdf_docs):
-    text = ""
-    for pdf in pdf_docs:
-        pdf_reader = PdfReader(pdf)
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-    return text
+# Chunks of at most PDFCHAT_CHUNK_TOKENS tokens that follow page and section boundaries.
+chunker = TokenChunker(max_tokens=config.CHUNK_TOKENS, overlap=config.CHUNK_OVERLAP)
 
-def get_text_chunks(text):
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=50000, chunk_overlap=1000)
-    chunks = text_splitter.split_text(text)
-    return chunks
+@st.cache_resource
+def get_embeddings():
+    """One embeddings backend (``PDFCHAT_EMBEDDINGS``) for the whole server, shared by every session."""
+    return make_embeddings()
 
-def get_vector_store(text_chunks):
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vector_store = FAISS.from_texts(text_chunks, embedding=embeddings)
-    vector_store.save_local("faiss_index")
+def update_vector_store(pdf_docs, collection):
+    """Queues a background job that embeds only new or changed chunks into the collection
+    and drops removed documents.
 
+    Each job publishes a new version of the collection atomically; concurrent uploads to
+    the same collection wait for each other, uploads to different collections don't.
+    """
+    job = ingest_queue.submit(collection, pdf_docs, get_embeddings(), chunker)
+    st.session_state.setdefault("ingest_jobs", []).append(job.id)
+    return job
+
+def show_ingest_progress():
+    """Progress of this session's ingestion jobs, refreshed every second while one is running."""
+    jobs = [ingest_queue.get(job_id) for job_id in st.session_state.get("ingest_jobs", [])]
+    jobs = [job for job in jobs if job is not None]
+    if not jobs:
+        return
+
+    @st.fragment(run_every=1 if any(job.active for job in jobs) else None)
+    def progress():
+        still_running = False
+        for job in jobs:
+            if job.active:
+                still_running = True
+                st.progress(job.fraction(), text=f"{job.collection}: {job.describe()}")
+            elif job.error:
+                st.error(f"{job.collection}: {job.error}")
+            else:
+                stats = job.stats
+                st.success(f"Done: collection {job.collection}, version {stats['version']} "
+                           f"({job.finished - job.started:.0f}s)")
+                st.caption(
+                    f"{stats['new_docs']} new, {stats['unchanged_docs']} unchanged and {stats['removed_docs']} removed "
+                    f"document(s); {job.pages} page(s) read, {stats['embedded_chunks']} chunk(s) embedded, "
+                    f"{stats['deleted_chunks']} deleted."
+                )
+        last_finished = max(job.finished or 0 for job in jobs)
+        if not still_running and last_finished > st.session_state.get("ingest_seen", 0):
+            # Refresh the whole page once, so the collection list shows the new version.
+            st.session_state["ingest_seen"] = last_finished
+            st.rerun()
+
+    progress()
+
+def select_collection():
+    """Sidebar picker for the collection to ask questions about and to upload into."""
+    names = list_collections(config.INDEX_DIR)
+    if config.DEFAULT_COLLECTION not in names:
+        names.insert(0, config.DEFAULT_COLLECTION)
+    new = "➕ New collection..."
+    choice = st.sidebar.selectbox("📚 Collection", names + [new])
+    if choice != new:
+        return choice
+    name = st.sidebar.text_input("New collection name").strip()
+    if not name:
+        return None
+    try:
+        collection_path(config.INDEX_DIR, name)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return None
+    return name
+
+@st.cache_resource
 def get_conversational_chain():
     prompt_template = """
     Answer the question as detailed as possible from the provided context, make sure to provide all the details. If the answer is not in
@@ -43,41 +101,108 @@ def get_conversational_chain():
     """
     model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.3)
     prompt = PromptTemplate(template=prompt_template, input_variables=["context", "question"])
-    chain = load_qa_chain(model, chain_type="stuff", prompt=prompt)
+    # prompt | model | parser streams the reply as plain text chunks.
+    chain = prompt | model | StrOutputParser()
     return chain
 
-def user_input(user_question):
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    new_db = FAISS.load_local("faiss_index", embeddings, allow_dangerous_deserialization=True)
-    docs = new_db.similarity_search(user_question)
+def stream_answer(chain, docs, user_question, asked_at):
+    """Yields the answer as it is generated and logs time to first token and total time."""
+    # Same "stuff" layout as load_qa_chain: every retrieved chunk, separated by blank lines.
+    context = "\n\n".join(doc.page_content for doc in docs)
+    first_token = None
+    length = 0
+    for chunk in chain.stream({"context": context, "question": user_question}):
+        if first_token is None:
+            first_token = time.perf_counter() - asked_at
+        length += len(chunk)
+        yield chunk
+    total = time.perf_counter() - asked_at
+    print(f"Answer: first token after {first_token or total:.2f}s, complete after {total:.2f}s ({length} chars)")
+
+def format_source(doc):
+    """``name.pdf p. 3-4`` for a retrieved chunk."""
+    first, last = doc.metadata.get("pages", (None, None))
+    if first is None:
+        return doc.metadata.get("source", "?")
+    return f"{doc.metadata.get('source')} p. {first}" + (f"-{last}" if last != first else "")
+
+def show_cached_answer(cached, similarity, asked_at):
+    print(f"Answer cache hit ({similarity:.3f} similar to {cached['question']!r}) "
+          f"in {time.perf_counter() - asked_at:.2f}s")
+    st.write("Reply: ", cached["answer"])
+    st.caption("Sources: " + "; ".join(cached["sources"]) + " (cached answer)")
+
+
+def user_input(user_question, collection):
+    asked_at = time.perf_counter()
+    # Loaded once per server and collection, and reused until a new version is published.
+    embeddings = get_embeddings()
+    path = collection_path(config.INDEX_DIR, collection)
+    index = index_cache.entry(path, embeddings)
+    if index is None:
+        st.warning("Upload your PDF files and click Submit & Process first.")
+        return
+    if index["embedding_model"] != embeddings.model:
+        st.warning("The index was built with a different embedding model. Click Submit & Process to rebuild it.")
+        return
+    retriever = index["retriever"]
+    # Answers are reused only for the index version they were computed from.
+    version = index["version"]
+    cached = answer_cache.lookup(collection, version, user_question)
+    if cached is not None:
+        show_cached_answer(cached, 1.0, asked_at)
+        return
+    # Embedded at most once, and only if retrieval needs it (not on the keyword-only path).
+    vector = None
+
+    def embed_question():
+        nonlocal vector
+        if vector is None:
+            vector = embeddings.embed_query(user_question)
+        return vector
+
+    docs, how = retriever.search(user_question, k=config.RETRIEVAL_K, mode=config.RETRIEVAL_MODE,
+                                 embed=embed_question)
+    print(f"Retrieved {len(docs)} chunk(s) by {how} search in {time.perf_counter() - asked_at:.2f}s")
+    cached, similarity = answer_cache.match(collection, version, vector)
+    if cached is not None:
+        show_cached_answer(cached, similarity, asked_at)
+        return
     chain = get_conversational_chain()
-    response = chain(
-        {"input_documents": docs, "question": user_question},
-        return_only_outputs=True
-    )
+    st.write("Reply: ")
+    response = st.write_stream(stream_answer(chain, docs, user_question, asked_at))
     print(response)
-    st.write("Reply: ", response["output_text"])
+    sources = [format_source(doc) for doc in docs]
+    st.caption("Sources: " + "; ".join(sources))
+    answer_cache.store(collection, version, user_question, response, sources, vector)
 
 def main():
     st.set_page_config("Multi PDF Chatbot", page_icon=":scroll:")
     st.header("Multi-PDF's 📚 - Chat Agent 🤖")
+    collection = select_collection()
     
     # Main input for user questions
     user_question = st.text_input("Ask a Question from the PDF Files uploaded .. ✍️📝")
-    if user_question:
-        user_input(user_question)
+    if user_question and collection:
+        user_input(user_question, collection)
 
     # Sidebar: Overview, features, and PDF file uploader
     with st.sidebar:
         st.markdown("# Multi-PDF Chat Agent")
         st.title("📁 PDF File's Section")
         pdf_docs = st.file_uploader("Upload your PDF Files & \nClick on the Submit & Process Button", accept_multiple_files=True)
-        if st.button("Submit & Process"):
-            with st.spinner("Processing..."):
-                raw_text = get_pdf_text(pdf_docs)
-                text_chunks = get_text_chunks(raw_text)
-                get_vector_store(text_chunks)
-                st.success("Done")
+        if st.button("Submit & Process", disabled=not collection):
+            if pdf_docs:
+                update_vector_store(pdf_docs, collection)
+            else:
+                st.warning("Upload at least one PDF file first.")
+        show_ingest_progress()
+        if answer_cache.enabled and answer_cache.stats()["lookups"]:
+            stats = answer_cache.stats()
+            st.caption(
+                f"Answer cache: {stats['hits']} of {stats['lookups']} question(s) answered from cache "
+                f"({stats['hit_rate']:.0%}, {stats['semantic_hits']} by similarity), {stats['entries']} stored."
+            )
                 
         st.write("---")
         st.markdown("## Overview")
@@ -88,7 +213,7 @@ def main():
         )
         st.markdown("## Features")
         st.write("- **Multi-PDF Upload:** Process multiple PDF files at once.")
-        st.write("- **Semantic Search:** Utilizes Google Generative AI embeddings with FAISS for efficient search.")
+        st.write("- **Semantic Search:** Utilizes Google Generative AI (or local hashing) embeddings with FAISS for efficient search.")
         st.write("- **Detailed Q&A:** Provides comprehensive answers based on the document content.")
         st.write("- **Interactive Chat:** A user-friendly interface to ask questions and get real-time responses.")
         st.write("---")
@@ -0,0 +1 @@
+"""Ingestion and retrieval helpers for the Multi-PDF chat app (``chatapp.py``)."""
@@ -0,0 +1,137 @@
+"""Semantic cache of answers, per collection and index version.
+
+Questions are matched first by their normalised text (``lookup``) and then, once the
+question has been embedded for retrieval anyway, by cosine similarity of their
+embeddings (``match``): a stored answer is reused when the best match reaches
+``threshold``. The cache never embeds a question itself, so questions answered by the
+keyword-only retrieval path are only matched by text.
+Entries are scoped to the collection's index version, so publishing a new version
+drops every answer computed from the old one. The cache is bounded: least recently used
+entries are evicted beyond ``max_entries`` and entries older than ``ttl`` seconds
+expire. Like ``index_cache``, ``answer_cache`` below is shared by every session.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from pdfchat import config
+
+
+def normalise(question):
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+class AnswerCache:
+    """``{collection: (index version, {question: entry})}`` with LRU and TTL eviction."""
+
+    def __init__(self, max_entries=1000, ttl=86400, threshold=0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._collections = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _entries(self, collection, version):
+        """The collection's entries for ``version``, dropping those of any older version."""
+        current = self._collections.get(collection)
+        if current is None or current[0] != version:
+            if current is not None:
+                self.invalidations += len(current[1])
+            current = self._collections[collection] = (version, OrderedDict())
+        return current[1]
+
+    def _expire(self, entries, now):
+        for key in [k for k, e in entries.items() if now - e["created"] > self.ttl]:
+            del entries[key]
+            self.expirations += 1
+
+    def lookup(self, collection, version, question):
+        """The entry stored for the same normalised ``question``, or None."""
+        if not self.enabled:
+            return None
+        key = normalise(question)
+        with self._lock:
+            self.lookups += 1
+            entries = self._entries(collection, version)
+            self._expire(entries, time.time())
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def match(self, collection, version, vector):
+        """``(entry or None, similarity)``: the stored question most similar to ``vector``.
+
+        Call after a ``lookup`` miss, with the question's embedding.
+        """
+        if not self.enabled or vector is None:
+            return None, 0.0
+        vector = _unit(vector)
+        with self._lock:
+            entries = self._entries(collection, version)
+            candidates = [(key, e) for key, e in entries.items() if e["vector"] is not None]
+            if not candidates:
+                return None, 0.0
+            similarities = np.stack([e["vector"] for _, e in candidates]) @ vector
+            index = int(np.argmax(similarities))
+            best_key, best = candidates[index][0], float(similarities[index])
+            if best < self.threshold:
+                return None, best
+            entries.move_to_end(best_key)
+            self.hits += 1
+            self.semantic_hits += 1
+            return entries[best_key], best
+
+    def store(self, collection, version, question, answer, sources, vector):
+        if not self.enabled:
+            return
+        with self._lock:
+            entries = self._entries(collection, version)
+            entries[normalise(question)] = {
+                "question": question,
+                "answer": answer,
+                "sources": sources,
+                "vector": _unit(vector) if vector is not None else None,
+                "created": time.time(),
+            }
+            while sum(len(e) for _, e in self._collections.values()) > self.max_entries:
+                # Evict the least recently used entry of the largest collection.
+                _, largest = max(self._collections.values(), key=lambda c: len(c[1]))
+                largest.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        return {
+            "entries": sum(len(e) for _, e in self._collections.values()),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+answer_cache = AnswerCache(
+    max_entries=config.ANSWER_CACHE_SIZE, ttl=config.ANSWER_CACHE_TTL, threshold=config.ANSWER_CACHE_THRESHOLD
+)
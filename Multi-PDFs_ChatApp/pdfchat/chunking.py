@@ -0,0 +1,156 @@
+"""Token-budgeted, page- and section-aware chunking of extracted PDF pages.
+
+Pages are broken into units (headings, then sentences, then word windows for sentences
+that are still too long) and packed greedily into chunks of at most ``max_tokens``
+tokens. A heading starts a new chunk once the current one is reasonably full, so chunks
+rarely straddle two sections; otherwise consecutive chunks share up to ``overlap``
+tokens of trailing sentences. Every chunk carries the pages it spans and the heading of
+its section.
+
+Tokens are counted with ``tiktoken`` when it is installed and its encoding can be
+loaded (the first use downloads it), and estimated otherwise (roughly one token per
+four characters of each word or punctuation mark).
+"""
+import math
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+WORD_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+HEADING_RE = re.compile(
+    r"^(?:(?:\d+(?:\.\d+)*\.?|[IVXLC]+\.|[A-Z]\.)\s+\S.*|(?:chapter|section|appendix|part)\s+\S.*)$",
+    re.IGNORECASE,
+)
+
+_encoding = None
+_encoding_failed = False
+
+
+def _encoder():
+    """The cl100k_base encoding, or None without ``tiktoken`` or when it can't be loaded."""
+    global _encoding, _encoding_failed
+    if _encoding is None and tiktoken is not None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            print(f"Could not load the tiktoken encoding ({e}); estimating token counts instead")
+            _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text):
+    """Tokens in ``text``: exact with ``tiktoken`` (cl100k_base), estimated without it."""
+    encoding = _encoder()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum(math.ceil(len(word) / 4) for word in WORD_RE.findall(text))
+
+
+def is_heading(line):
+    """A short line that looks like a numbered or all-caps title."""
+    if not 2 < len(line) <= 80 or line[-1] in ".,;:":
+        return False
+    if HEADING_RE.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and all(c.isupper() for c in letters)
+
+
+class TokenChunker:
+    """Callable that turns ``[(page number, text), ...]`` into ``[(chunk text, metadata), ...]``."""
+
+    def __init__(self, max_tokens=512, overlap=64):
+        if not 0 <= overlap < max_tokens:
+            raise ValueError("overlap must be non-negative and smaller than max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+        # Recorded in the index manifest: changing any of these re-chunks every document.
+        self.name = f"tokens-{max_tokens}-{overlap}-{'tiktoken' if _encoder() else 'estimate'}"
+
+    def _units(self, pages):
+        """``(text, tokens, page, heading)`` in reading order."""
+        for page, text in pages:
+            block = []
+            # Re-join words hyphenated across line breaks before splitting into lines.
+            for line in re.sub(r"(\w)-\n(\w)", r"\1\2", text).splitlines() + [""]:
+                line = " ".join(line.split())
+                if line and not is_heading(line):
+                    block.append(line)
+                    continue
+                if block:
+                    yield from self._sentences(" ".join(block), page)
+                    block = []
+                if line:
+                    yield line, count_tokens(line), page, True
+
+    def _sentences(self, text, page):
+        for sentence in SENTENCE_RE.split(text):
+            tokens = count_tokens(sentence)
+            if tokens <= self.max_tokens:
+                yield sentence, tokens, page, False
+                continue
+            words, window = sentence.split(), []
+            for word in words:
+                if window and count_tokens(" ".join(window + [word])) > self.max_tokens:
+                    piece = " ".join(window)
+                    yield piece, count_tokens(piece), page, False
+                    window = []
+                window.append(word)
+            if window:
+                piece = " ".join(window)
+                yield piece, count_tokens(piece), page, False
+
+    def __call__(self, pages):
+        chunks = []
+        current, size = [], 0
+        section = chunk_section = None
+
+        def flush(keep_overlap, incoming=0):
+            nonlocal current, size, chunk_section
+            body = [u for u in current if not u[3]]
+            if body:
+                chunks.append((_join(current), {
+                    "pages": [current[0][2], current[-1][2]],
+                    "section": chunk_section,
+                }))
+            tail, tail_size = [], 0
+            # The tail and the unit that caused the flush must still fit in one chunk.
+            budget = min(self.overlap, self.max_tokens - incoming)
+            if keep_overlap and body:
+                for unit in reversed(body):
+                    if tail_size + unit[1] > budget:
+                        break
+                    tail.insert(0, unit)
+                    tail_size += unit[1]
+            current, size = tail, tail_size
+            chunk_section = section
+
+        for unit in self._units(pages):
+            text, tokens, page, heading = unit
+            if heading:
+                if size >= self.max_tokens // 4:
+                    flush(keep_overlap=False)
+                section = text
+                if all(u[3] for u in current):
+                    chunk_section = section
+            elif size + tokens > self.max_tokens and current:
+                flush(keep_overlap=True, incoming=tokens)
+            current.append(unit)
+            size += tokens
+        flush(keep_overlap=False)
+        return chunks
+
+
+def _join(units):
+    """Headings on their own line, sentences of a paragraph run together."""
+    parts = []
+    for text, _, _, heading in units:
+        if heading:
+            parts.append(("\n" if parts else "") + text + "\n")
+        else:
+            parts.append(text if not parts or parts[-1].endswith("\n") else " " + text)
+    return "".join(parts).strip()
@@ -0,0 +1,73 @@
+"""Multi-PDF chat settings, read once from the environment (or a ``.env`` file)."""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Root of the index collections: one versioned sub-directory per collection.
+INDEX_DIR = os.getenv("PDFCHAT_INDEX_DIR", "faiss_index")
+# Collection selected when the app opens.
+DEFAULT_COLLECTION = os.getenv("PDFCHAT_DEFAULT_COLLECTION", "default")
+# Published versions kept per collection (older ones are deleted on publish).
+KEEP_VERSIONS = int(os.getenv("PDFCHAT_KEEP_VERSIONS", "2"))
+# Ingestion jobs run at once (jobs for the same collection still run one after another).
+INGEST_WORKERS = int(os.getenv("PDFCHAT_INGEST_WORKERS", "2"))
+
+# FAISS index type: "flat" (exact), "ivf", "hnsw" or "pq" (IVF with product quantisation).
+FAISS_INDEX = os.getenv("PDFCHAT_FAISS_INDEX", "flat").strip().lower()
+# IVF cells (0 = about 4 * sqrt(vectors)) and cells searched per query.
+FAISS_NLIST = int(os.getenv("PDFCHAT_FAISS_NLIST", "0"))
+FAISS_NPROBE = int(os.getenv("PDFCHAT_FAISS_NPROBE", "16"))
+# HNSW graph degree and build/search breadth.
+FAISS_HNSW_M = int(os.getenv("PDFCHAT_FAISS_HNSW_M", "32"))
+FAISS_EF_CONSTRUCTION = int(os.getenv("PDFCHAT_FAISS_EF_CONSTRUCTION", "80"))
+FAISS_EF_SEARCH = int(os.getenv("PDFCHAT_FAISS_EF_SEARCH", "64"))
+# Bytes per vector for "pq" (0 = about dim / 8).
+FAISS_PQ_M = int(os.getenv("PDFCHAT_FAISS_PQ_M", "0"))
+# Vectors sampled to train "ivf" and "pq".
+FAISS_TRAIN_SAMPLE = int(os.getenv("PDFCHAT_FAISS_TRAIN_SAMPLE", "50000"))
+# Memory-map the index read-only when answering questions.
+FAISS_MMAP = _flag("PDFCHAT_FAISS_MMAP", default=True)
+
+# Chunk budget and overlap in tokens (tiktoken's cl100k_base when installed and loadable, estimated otherwise).
+CHUNK_TOKENS = int(os.getenv("PDFCHAT_CHUNK_TOKENS", "512"))
+CHUNK_OVERLAP = int(os.getenv("PDFCHAT_CHUNK_OVERLAP", "64"))
+# Chunks retrieved as context for each question.
+RETRIEVAL_K = int(os.getenv("PDFCHAT_RETRIEVAL_K", "4"))
+
+# "hybrid" (BM25 + vector, fused by reciprocal rank, keyword-only when BM25 is confident)
+# or "vector" (similarity search only).
+RETRIEVAL_MODE = os.getenv("PDFCHAT_RETRIEVAL", "hybrid").strip().lower()
+# BM25 answers alone when its top chunk matches every question term and outscores the
+# runner-up by this factor.
+KEYWORD_MARGIN = float(os.getenv("PDFCHAT_KEYWORD_MARGIN", "1.5"))
+
+# Answer cache: entries kept (0 disables it), their lifetime in seconds, and the cosine
+# similarity between questions above which a stored answer is reused.
+ANSWER_CACHE_SIZE = int(os.getenv("PDFCHAT_ANSWER_CACHE_SIZE", "1000"))
+ANSWER_CACHE_TTL = float(os.getenv("PDFCHAT_ANSWER_CACHE_TTL", "86400"))
+ANSWER_CACHE_THRESHOLD = float(os.getenv("PDFCHAT_ANSWER_CACHE_THRESHOLD", "0.95"))
+
+# Embeddings backend: "google" (Gemini API) or "hashing" (local, offline, deterministic).
+EMBEDDINGS = os.getenv("PDFCHAT_EMBEDDINGS", "google").strip().lower()
+# Vector size of the hashing backend.
+HASHING_DIM = int(os.getenv("PDFCHAT_HASHING_DIM", "768"))
+
+# Google embedding model used for chunks and questions.
+GOOGLE_EMBEDDING_MODEL = os.getenv("PDFCHAT_GOOGLE_EMBEDDING_MODEL", "models/embedding-001")
+# Persistent embedding cache (SQLite), keyed by model + chunk hash.
+EMBEDDING_CACHE = os.getenv("PDFCHAT_EMBEDDING_CACHE", "embedding_cache.sqlite3")
+# Texts per embedding request (the Gemini embedding API accepts up to 100).
+EMBEDDING_BATCH_SIZE = int(os.getenv("PDFCHAT_EMBEDDING_BATCH_SIZE", "100"))
+# Embedding requests in flight at once, and retries (with exponential backoff) per request.
+EMBEDDING_CONCURRENCY = int(os.getenv("PDFCHAT_EMBEDDING_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("PDFCHAT_EMBEDDING_MAX_RETRIES", "5"))
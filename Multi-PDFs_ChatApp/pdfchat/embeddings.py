@@ -0,0 +1,195 @@
+"""Embeddings with a persistent cache and batched, rate-aware provider calls.
+
+``CachedEmbeddings`` wraps any LangChain embeddings object. Vectors are stored in SQLite
+keyed by the SHA-256 of ``model`` plus the text, so a chunk is embedded once per model,
+ever, across runs and indexes. Cache misses are de-duplicated, grouped into batches no
+larger than the provider accepts per request, and sent with bounded concurrency; a
+failed batch is retried with exponential backoff and jitter (which also rides out
+rate-limit errors).
+
+``HashingEmbeddings`` is a CPU-local alternative that needs no network or API key: it
+feature-hashes word unigrams and bigrams into a fixed-size, L2-normalised vector. It is
+deterministic, so indexes and benchmarks built with it are reproducible.
+``make_embeddings`` picks the backend from configuration.
+"""
+import hashlib
+import math
+import re
+import random
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+
+from langchain_core.embeddings import Embeddings
+
+from pdfchat import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+# SQLite caps the number of bound parameters per statement.
+LOOKUP_CHUNK = 500
+BACKENDS = ("google", "hashing")
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def cache_key(model, text):
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite table of ``key -> float32 vector``. Safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get_many(self, keys):
+        found = {}
+        with closing(self._connect()) as conn:
+            for i in range(0, len(keys), LOOKUP_CHUNK):
+                part = keys[i:i + LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})", part
+                )
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+        return found
+
+    def put_many(self, model, items):
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) VALUES (?, ?, ?, ?)",
+                [(key, model, array("f", vector).tobytes(), now) for key, vector in items],
+            )
+
+
+class CachedEmbeddings(Embeddings):
+    """Cache-first embeddings: only texts never embedded with ``model`` reach the provider."""
+
+    def __init__(self, underlying, model, cache_path, batch_size=100, max_concurrency=4,
+                 max_retries=5, base_delay=1.0):
+        self.underlying = underlying
+        self.model = model
+        self.cache = EmbeddingCache(cache_path)
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.hits = 0
+        self.misses = 0
+
+    def _with_retries(self, call, *args):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return call(*args)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.base_delay * 2 ** attempt * (0.5 + random.random())
+                print(f"Embedding request failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def embed_documents(self, texts):
+        keys = [cache_key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(list(set(keys)))
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - sum(1 for key in keys if key in missing)
+        self.misses += len(missing)
+
+        pending = list(missing.items())
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                futures = {
+                    pool.submit(self._with_retries, self.underlying.embed_documents, [t for _, t in batch]): batch
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    embedded = list(zip((k for k, _ in batch), future.result()))
+                    # Persist each batch as it lands, so an interrupted run keeps its progress.
+                    self.cache.put_many(self.model, embedded)
+                    vectors.update(embedded)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        # Providers may embed queries differently from documents, so they get their own keys.
+        key = cache_key(f"{self.model}:query", text)
+        cached = self.cache.get_many([key])
+        if key in cached:
+            self.hits += 1
+            return cached[key]
+        self.misses += 1
+        vector = self._with_retries(self.underlying.embed_query, text)
+        self.cache.put_many(self.model, [(key, vector)])
+        return vector
+
+
+class HashingEmbeddings(Embeddings):
+    """Signed feature hashing of word unigrams and bigrams with sublinear term frequency."""
+
+    def __init__(self, dim=768):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def _bucket(self, feature):
+        digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
+
+    def _embed(self, text):
+        words = TOKEN_RE.findall(text.lower())
+        counts = {}
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            counts[feature] = counts.get(feature, 0) + 1
+        vector = [0.0] * self.dim
+        for feature, count in counts.items():
+            index, sign = self._bucket(feature)
+            vector[index] += sign * (1.0 + math.log(count))
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def make_embeddings(backend=None):
+    """The embeddings backend named by ``backend`` (default: ``PDFCHAT_EMBEDDINGS``)."""
+    backend = backend or config.EMBEDDINGS
+    if backend == "hashing":
+        return HashingEmbeddings(dim=config.HASHING_DIM)
+    if backend == "google":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        return CachedEmbeddings(
+            GoogleGenerativeAIEmbeddings(model=config.GOOGLE_EMBEDDING_MODEL),
+            model=config.GOOGLE_EMBEDDING_MODEL,
+            cache_path=config.EMBEDDING_CACHE,
+            batch_size=config.EMBEDDING_BATCH_SIZE,
+            max_concurrency=config.EMBEDDING_CONCURRENCY,
+            max_retries=config.EMBEDDING_MAX_RETRIES,
+        )
+    raise ValueError(f"Unknown embeddings backend {backend!r}; expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,86 @@
+"""PDF text extraction fanned out over a process pool.
+
+``PdfReader.extract_text`` is pure Python and CPU-bound, so pages are extracted in
+worker processes, a range of pages per task. Results are yielded as
+``(doc, page, text)`` records in document/page order while later ranges are still being
+extracted, so chunking and embedding can start before extraction finishes.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+# Pages extracted per task: large enough to amortise task overhead, small enough to
+# spread a single long PDF over every worker.
+PAGES_PER_TASK = 8
+
+# Document bytes, shipped once to each worker by the pool initializer.
+_worker_docs = None
+
+
+def _read(pdf):
+    """``(name, bytes)`` for a path, a Streamlit ``UploadedFile``, any binary file object or
+    an already-read ``(name, bytes)`` pair."""
+    if isinstance(pdf, tuple):
+        return pdf
+    if isinstance(pdf, (str, os.PathLike)):
+        with open(pdf, "rb") as f:
+            return os.path.basename(pdf), f.read()
+    data = pdf.getvalue() if hasattr(pdf, "getvalue") else pdf.read()
+    return getattr(pdf, "name", "document.pdf"), data
+
+
+def _init_worker(docs):
+    global _worker_docs
+    _worker_docs = docs
+
+
+def _extract_range(doc_index, start, stop, docs=None):
+    reader = PdfReader(io.BytesIO((docs or _worker_docs)[doc_index]))
+    return [(page, reader.pages[page].extract_text() or "") for page in range(start, stop)]
+
+
+def iter_pdf_pages(pdf_docs, max_workers=None, pages_per_task=PAGES_PER_TASK, progress=None):
+    """Yields ``(doc name, page number, text)`` for every page, in order, as it is extracted.
+
+    ``max_workers=1`` (or a single small document) extracts in-process without a pool.
+    ``progress(pages done, pages total)`` is called as pages come in.
+    """
+    names, datas = zip(*(_read(pdf) for pdf in pdf_docs)) if pdf_docs else ((), ())
+    tasks = []
+    for doc_index, data in enumerate(datas):
+        page_count = len(PdfReader(io.BytesIO(data)).pages)
+        for start in range(0, page_count, pages_per_task):
+            tasks.append((doc_index, start, min(start + pages_per_task, page_count)))
+
+    total = sum(stop - start for _, start, stop in tasks)
+    done = 0
+    if progress:
+        progress(done, total)
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        for doc_index, start, stop in tasks:
+            for page, text in _extract_range(doc_index, start, stop, docs=datas):
+                done += 1
+                if progress:
+                    progress(done, total)
+                yield names[doc_index], page + 1, text
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+                             initargs=(datas,)) as pool:
+        futures = [(doc_index, pool.submit(_extract_range, doc_index, start, stop))
+                   for doc_index, start, stop in tasks]
+        try:
+            for doc_index, future in futures:
+                for page, text in future.result():
+                    done += 1
+                    if progress:
+                        progress(done, total)
+                    yield names[doc_index], page + 1, text
+        finally:
+            # The consumer may stop early (error, rerun): don't extract what nobody will read.
+            for _, future in futures:
+                future.cancel()
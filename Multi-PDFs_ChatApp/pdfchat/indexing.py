@@ -0,0 +1,167 @@
+"""Incremental FAISS indexing driven by a manifest of content hashes.
+
+Next to the FAISS files, ``manifest.json`` records every indexed document by the
+SHA-256 of its bytes, together with the ids of its chunks (the SHA-256 of each chunk's
+text, which is also its id in the vector store). On each sync:
+
+* documents whose hash is already in the manifest are neither re-read nor re-embedded;
+* only chunks whose id is not in the index yet are embedded and added;
+* chunks no longer referenced by any uploaded document are deleted from the index.
+
+Re-submitting an unchanged set of PDFs therefore makes no embedding calls at all. The
+manifest also records the embedding model and the chunker; vectors from different
+models can't share an index and new chunk settings change every chunk, so switching
+either rebuilds it. The FAISS index type (see ``pdfchat.vectorindex``) is recorded too:
+changing it, or deleting from a type that can't delete in place, rebuilds the vectors
+from the chunks already indexed without re-reading any PDF.
+"""
+import hashlib
+import json
+import os
+from itertools import groupby
+from operator import itemgetter
+
+from pdfchat.extraction import _read, iter_pdf_pages
+from pdfchat.vectorindex import (
+    build_vector_store, load_vector_store, min_vectors, save_vector_store, supports_delete,
+)
+
+MANIFEST = "manifest.json"
+# Chunks embedded per progress report.
+EMBED_BATCH = 256
+
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(index_dir):
+    try:
+        with open(os.path.join(index_dir, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 0, "documents": {}}
+
+
+def save_manifest(index_dir, manifest):
+    path = os.path.join(index_dir, MANIFEST)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, path)
+
+
+def embed_texts(embeddings, texts, progress=None):
+    """``embeddings.embed_documents(texts)`` in batches, calling ``progress(done, total)``."""
+    vectors = []
+    if progress:
+        progress(0, len(texts))
+    for start in range(0, len(texts), EMBED_BATCH):
+        vectors.extend(embeddings.embed_documents(texts[start:start + EMBED_BATCH]))
+        if progress:
+            progress(len(vectors), len(texts))
+    return vectors
+
+
+def sync_index(pdf_docs, embeddings, chunker, index_dir="faiss_index", index_type="flat", progress=None):
+    """Makes the index in ``index_dir`` match exactly the given documents.
+
+    ``chunker`` turns one document's ``[(page, text), ...]`` into ``[(chunk, metadata), ...]``
+    (see ``pdfchat.chunking.TokenChunker``). Returns counts of what changed:
+    ``new_docs``, ``unchanged_docs``, ``removed_docs``, ``embedded_chunks``,
+    ``deleted_chunks``, whether the vectors were ``rebuilt`` and the manifest ``version``
+    after the sync. ``progress(phase, done, total)`` reports ``"extract"`` (pages) and
+    ``"embed"`` (chunks) as they advance.
+    """
+    manifest = load_manifest(index_dir)
+    model = getattr(embeddings, "model", None)
+    chunking = getattr(chunker, "name", None)
+    same_settings = manifest.get("embedding_model") == model and manifest.get("chunker") == chunking
+    indexed = manifest["documents"] if same_settings else {}
+
+    uploads = {}
+    for pdf in pdf_docs:
+        name, data = _read(pdf)
+        uploads.setdefault(content_hash(data), (name, data))
+    new_hashes = [h for h in uploads if h not in indexed]
+    removed_hashes = [h for h in indexed if h not in uploads]
+
+    # Extract and chunk only documents the index has never seen. Records are keyed by
+    # document hash so that two uploads sharing a file name stay apart.
+    new_chunks = {}
+    documents = {h: indexed[h] for h in uploads if h in indexed}
+    documents.update({h: {"name": uploads[h][0], "chunks": []} for h in new_hashes})
+    records = iter_pdf_pages(
+        [(h, uploads[h][1]) for h in new_hashes],
+        progress=progress and (lambda done, total: progress("extract", done, total)),
+    )
+    for doc_hash, pages in groupby(records, key=itemgetter(0)):
+        chunk_ids = documents[doc_hash]["chunks"]
+        for chunk, metadata in chunker([(page, text) for _, page, text in pages]):
+            chunk_id = content_hash(chunk)
+            if chunk_id not in new_chunks:
+                new_chunks[chunk_id] = (chunk, {**metadata, "source": uploads[doc_hash][0], "doc_hash": doc_hash})
+            if chunk_id not in chunk_ids:
+                chunk_ids.append(chunk_id)
+
+    stored = {c for doc in indexed.values() for c in doc["chunks"]}
+    wanted = {c for doc in documents.values() for c in doc["chunks"]}
+    to_delete = sorted(stored - wanted)
+    to_add = [c for c in new_chunks if c not in stored]
+
+    stats = {
+        "new_docs": len(new_hashes),
+        "unchanged_docs": len(uploads) - len(new_hashes),
+        "removed_docs": len(removed_hashes),
+        "embedded_chunks": len(to_add),
+        "deleted_chunks": len(to_delete),
+        "rebuilt": False,
+        "version": manifest["version"],
+    }
+    built = manifest.get("index_built", "flat")
+    rebuild = bool(indexed) and bool(wanted) and (
+        manifest.get("index_type", "flat") != index_type
+        or (to_delete and not supports_delete(built))
+        or (built != index_type and len(wanted) >= min_vectors(index_type))
+    )
+    if not to_add and not to_delete and not new_hashes and not removed_hashes and not rebuild:
+        return stats
+
+    manifest = {"version": manifest["version"] + 1, "embedding_model": model, "chunker": chunking,
+                "index_type": index_type, "index_built": built, "documents": documents}
+    stats["version"] = manifest["version"]
+    os.makedirs(index_dir, exist_ok=True)
+    if not wanted:
+        for name in ("index.faiss", "index.pkl"):
+            if os.path.exists(os.path.join(index_dir, name)):
+                os.remove(os.path.join(index_dir, name))
+        save_manifest(index_dir, manifest)
+        return stats
+
+    # An index written before manifests existed can't be diffed: rebuild it instead.
+    store = load_vector_store(index_dir, embeddings, kind=built) if indexed else None
+    texts = [new_chunks[c][0] for c in to_add]
+    metadatas = [new_chunks[c][1] for c in to_add]
+    if store is not None and rebuild:
+        kept = [c for c in store.index_to_docstore_id.values() if c in wanted]
+        docs = [store.docstore.search(c) for c in kept]
+        texts = [doc.page_content for doc in docs] + texts
+        metadatas = [doc.metadata for doc in docs] + metadatas
+        to_add = kept + to_add
+        store = None
+        stats["rebuilt"] = True
+    vectors = embed_texts(embeddings, texts, progress and (lambda done, total: progress("embed", done, total)))
+    if store is None:
+        store, manifest["index_built"] = build_vector_store(
+            texts, embeddings, metadatas, to_add, kind=index_type, vectors=vectors
+        )
+    else:
+        if to_delete:
+            store.delete(to_delete)
+        if to_add:
+            store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=to_add)
+    save_vector_store(store, index_dir)
+    save_manifest(index_dir, manifest)
+    return stats
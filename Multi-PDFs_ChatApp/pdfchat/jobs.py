@@ -0,0 +1,152 @@
+"""Background ingestion jobs with progress reporting.
+
+``Submit & Process`` used to extract, chunk and embed inside the Streamlit script
+thread, which blocked the session and was lost on rerun. ``IngestQueue.submit`` reads
+the uploads' bytes up front (Streamlit upload objects don't outlive the rerun) and
+hands the work to a small pool of worker threads; page extraction itself still fans out
+over the process pool. Each ``IngestJob`` tracks its phase, pages extracted, chunks
+embedded and an ETA for the current phase. Questions keep being answered from the
+collection's published version until the job publishes the next one.
+
+Like ``index_cache``, the ``ingest_queue`` below is shared by every session of the
+server.
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from pdfchat import config
+from pdfchat.extraction import _read
+from pdfchat.namespaces import sync_collection
+
+PHASES = {
+    "queued": "Queued",
+    "waiting": "Waiting for the collection",
+    "extract": "Extracting pages",
+    "embed": "Embedding chunks",
+    "done": "Done",
+    "failed": "Failed",
+}
+
+
+class IngestJob:
+    """State of one ingestion, updated by its worker thread and read by any session."""
+
+    def __init__(self, job_id, collection, documents):
+        self.id = job_id
+        self.collection = collection
+        self.documents = documents
+        self.phase = "queued"
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.done = 0
+        self.total = 0
+        self.pages = 0
+        self.chunks = 0
+        self._phase_started = None
+        self.stats = None
+        self.error = None
+
+    @property
+    def active(self):
+        return self.phase not in ("done", "failed")
+
+    def _progress(self, phase, done, total):
+        if phase != self.phase:
+            self.phase = phase
+            self._phase_started = time.time()
+        self.done, self.total = done, total
+        if phase == "extract":
+            self.pages = done
+        elif phase == "embed":
+            self.chunks = done
+
+    def eta(self):
+        """Seconds left in the current phase, extrapolated from its rate so far (None if unknown)."""
+        if self.phase not in ("extract", "embed") or not self.done or not self._phase_started:
+            return None
+        elapsed = time.time() - self._phase_started
+        return elapsed / self.done * (self.total - self.done)
+
+    def fraction(self):
+        return self.done / self.total if self.total else 0.0
+
+    def describe(self):
+        """One line for the UI, e.g. ``Extracting pages: 120/300, ~40s left``."""
+        text = PHASES[self.phase]
+        if self.phase in ("extract", "embed") and self.total:
+            text += f": {self.done}/{self.total}"
+            eta = self.eta()
+            if eta is not None:
+                text += f", ~{eta:.0f}s left"
+        return text
+
+    def run(self, embeddings, chunker):
+        self.started = time.time()
+        self.phase = "waiting"
+        try:
+            self.stats = sync_collection(
+                config.INDEX_DIR, self.collection, self.documents, embeddings, chunker,
+                index_type=config.FAISS_INDEX, keep_versions=config.KEEP_VERSIONS, progress=self._progress,
+            )
+            self.phase = "done"
+        except Exception as e:
+            print(f"Ingestion into {self.collection} failed: {e}")
+            self.error = str(e)
+            self.phase = "failed"
+        finally:
+            self.finished = time.time()
+            self.documents = None  # drop the PDF bytes
+
+
+class IngestQueue:
+    """Runs ``IngestJob``s on ``workers`` threads; remembers the last ``history`` jobs.
+
+    Jobs for one collection run in submission order on a single worker, so a backlog for
+    one collection never holds up the others.
+    """
+
+    def __init__(self, workers=2, history=50):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-ingest")
+        self._jobs = OrderedDict()
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.history = history
+
+    def submit(self, collection, pdf_docs, embeddings, chunker):
+        documents = [_read(pdf) for pdf in pdf_docs or ()]
+        with self._lock:
+            job = IngestJob(next(self._ids), collection, documents)
+            self._jobs[job.id] = job
+            finished = [j for j in self._jobs.values() if not j.active]
+            for old in finished[:max(0, len(self._jobs) - self.history)]:
+                del self._jobs[old.id]
+            queue = self._pending.get(collection)
+            if queue is None:
+                queue = self._pending[collection] = deque()
+                self._pool.submit(self._drain, collection, embeddings, chunker)
+            queue.append(job)
+        return job
+
+    def _drain(self, collection, embeddings, chunker):
+        while True:
+            with self._lock:
+                queue = self._pending[collection]
+                if not queue:
+                    del self._pending[collection]
+                    return
+                job = queue.popleft()
+            job.run(embeddings, chunker)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def active(self, collection=None):
+        return [j for j in list(self._jobs.values()) if j.active and collection in (None, j.collection)]
+
+
+ingest_queue = IngestQueue(workers=config.INGEST_WORKERS)
@@ -0,0 +1,136 @@
+"""Named index collections with atomic, versioned publishing.
+
+Each collection lives in ``<root>/<name>/``::
+
+    CURRENT          name of the published version, e.g. "v000007"
+    v000006/         an older version, kept for readers still using it
+    v000007/         index.faiss, index.pkl, manifest.json
+    .lock            held by the one writer allowed at a time
+
+Published version directories are never modified. A writer takes the collection lock,
+hard-links the current version's files into a staging directory (files are replaced,
+never rewritten, so links are safe), syncs it, renames it to the next version and then
+swaps ``CURRENT`` with ``os.replace``. Readers resolve ``CURRENT`` once and load that
+directory, so they see either the old or the new index, never a half-written one.
+Only the newest ``keep_versions`` are kept; a reader whose version is pruned before
+it is loaded re-resolves ``CURRENT`` once (see ``pdfchat.store``).
+"""
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from pdfchat.indexing import MANIFEST, sync_index
+
+CURRENT = "CURRENT"
+LOCK = ".lock"
+NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+VERSION_RE = re.compile(r"^v\d{6,}$")
+
+
+def collection_path(root, name):
+    if not NAME_RE.match(name or ""):
+        raise ValueError("Collection names use letters, digits, '-' and '_' (up to 64 characters).")
+    return os.path.join(root, name)
+
+
+def list_collections(root):
+    """Names of the collections under ``root`` that have a published version."""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return []
+    return [name for name in names if NAME_RE.match(name) and os.path.exists(os.path.join(root, name, CURRENT))]
+
+
+def current_dir(path):
+    """The published version directory of the collection at ``path``, or None."""
+    try:
+        with open(os.path.join(path, CURRENT), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(path, version) if VERSION_RE.match(version) else None
+
+
+def resolve_index_dir(path):
+    """Where the index files are: a collection's published version, or ``path`` itself."""
+    return current_dir(path) or path
+
+
+@contextmanager
+def writer_lock(path):
+    """Exclusive, cross-process lock on the collection at ``path``."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, LOCK), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _stage(source, staging):
+    for name in os.listdir(source):
+        src = os.path.join(source, name)
+        try:
+            os.link(src, os.path.join(staging, name))
+        except OSError:
+            shutil.copy2(src, os.path.join(staging, name))
+
+
+def _publish(path, version):
+    tmp = os.path.join(path, f"{CURRENT}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp, os.path.join(path, CURRENT))
+
+
+def _prune(path, keep):
+    versions = sorted(v for v in os.listdir(path) if VERSION_RE.match(v))
+    for version in versions[:-keep]:
+        # Readers that already loaded an old version keep their open (or mapped) files.
+        shutil.rmtree(os.path.join(path, version), ignore_errors=True)
+
+
+def sync_collection(root, name, pdf_docs, embeddings, chunker, index_type="flat", keep_versions=2,
+                    progress=None):
+    """``sync_index`` for collection ``name``, published as a new version if anything changed.
+
+    Returns the ``sync_index`` stats plus the ``collection`` name.
+    """
+    path = collection_path(root, name)
+    with writer_lock(path):
+        current = current_dir(path)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=path)
+        try:
+            if current is not None:
+                _stage(current, staging)
+            before = os.path.basename(current) if current else None
+            stats = sync_index(pdf_docs, embeddings, chunker, index_dir=staging, index_type=index_type,
+                               progress=progress)
+            version = f"v{stats['version']:06d}"
+            if version != before and os.path.exists(os.path.join(staging, MANIFEST)):
+                target = os.path.join(path, version)
+                shutil.rmtree(target, ignore_errors=True)  # left over by an interrupted writer
+                os.rename(staging, target)
+                _publish(path, version)
+                _prune(path, keep_versions)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return {**stats, "collection": name}
@@ -0,0 +1,135 @@
+"""Hybrid retrieval: BM25 over the indexed chunks fused with FAISS by reciprocal rank.
+
+``BM25Index`` is an in-memory inverted index built from the chunks already in the vector
+store, so both rankings see exactly the same documents. ``HybridRetriever.search``
+first asks BM25: when its best chunk contains every content term of the question
+(including terms no chunk contains, so such questions never qualify), at least ``k``
+chunks match, and the best clearly outscores the runner-up (acronyms, model names,
+exact phrases), the keyword ranking is returned as is and the question is never
+embedded. Otherwise the BM25 and vector rankings are fused with reciprocal-rank fusion
+(RRF).
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset("""
+a an and are as at be but by can did do does for from had has have how i if in into is it
+its me my no not of on or our so than that the their them then there these they this to
+was we were what when where which who why will with would you your about explain describe
+tell give list between
+""".split())
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def content_terms(text):
+    """Distinct query terms that carry meaning (stopwords dropped)."""
+    return {term for term in tokenize(text) if term not in STOPWORDS}
+
+
+class BM25Index:
+    """Okapi BM25 over ``[(doc id, text), ...]``. Stopwords in queries are ignored."""
+
+    def __init__(self, docs, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids = []
+        self.lengths = []
+        self.postings = defaultdict(list)
+        for doc_id, text in docs:
+            terms = Counter(tokenize(text))
+            index = len(self.ids)
+            self.ids.append(doc_id)
+            self.lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings[term].append((index, tf))
+        count = len(self.ids)
+        self.avg_length = sum(self.lengths) / count if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for term, posting in self.postings.items()
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k=10):
+        """Top ``k`` as ``[(doc id, score, matched query terms), ...]``, best first."""
+        scores = defaultdict(float)
+        matched = defaultdict(set)
+        for term in content_terms(query):
+            for index, tf in self.postings.get(term, ()):
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[index] / self.avg_length)
+                scores[index] += self.idf[term] * tf * (self.k1 + 1) / norm
+                matched[index].add(term)
+        best = sorted(scores, key=scores.get, reverse=True)[:k]
+        return [(self.ids[i], scores[i], matched[i]) for i in best]
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Doc ids ordered by ``sum(1 / (k + rank))`` over every ranking they appear in."""
+    fused = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    return sorted(fused, key=fused.get, reverse=True)
+
+
+class HybridRetriever:
+    """BM25 + vector retrieval over one loaded FAISS store."""
+
+    def __init__(self, store, fetch_k=20, keyword_margin=1.5, rrf_k=60):
+        self.store = store
+        self.fetch_k = fetch_k
+        self.keyword_margin = keyword_margin
+        self.rrf_k = rrf_k
+        docs = store.docstore._dict
+        self.bm25 = BM25Index((doc_id, docs[doc_id].page_content) for doc_id in store.index_to_docstore_id.values())
+        self.keyword_hits = 0
+        self.hybrid_hits = 0
+
+    def _keyword_confident(self, query, hits, k):
+        if len(hits) < max(k, 2):
+            return False
+        terms = content_terms(query)
+        if not terms or not terms <= hits[0][2]:
+            return False
+        return hits[0][1] >= self.keyword_margin * hits[1][1]
+
+    def vector_search(self, query, k, embed=None):
+        """Doc ids of the ``k`` nearest chunks to the embedded ``query``.
+
+        ``embed()``, if given, returns the query's embedding (e.g. one already computed).
+        """
+        vector = np.array([embed() if embed is not None else self.store._embed_query(query)], dtype=np.float32)
+        if self.store._normalize_L2:
+            import faiss
+
+            faiss.normalize_L2(vector)
+        _, indices = self.store.index.search(vector, k)
+        return [self.store.index_to_docstore_id[i] for i in indices[0] if i != -1]
+
+    def search(self, query, k=4, mode="hybrid", embed=None):
+        """``(documents, how)`` where ``how`` is ``"keyword"``, ``"hybrid"`` or ``"vector"``.
+
+        ``embed`` is passed to ``vector_search``; it is not called on the keyword-only path.
+        """
+        if mode == "vector":
+            ids, how = self.vector_search(query, k, embed), "vector"
+        else:
+            hits = self.bm25.search(query, self.fetch_k)
+            if self._keyword_confident(query, hits, k):
+                ids, how = [doc_id for doc_id, _, _ in hits[:k]], "keyword"
+                self.keyword_hits += 1
+            else:
+                keyword = [doc_id for doc_id, _, _ in hits]
+                ids = reciprocal_rank_fusion([keyword, self.vector_search(query, self.fetch_k, embed)], self.rrf_k)[:k]
+                how = "hybrid"
+                self.hybrid_hits += 1
+        return [self.store.docstore.search(doc_id) for doc_id in ids], how
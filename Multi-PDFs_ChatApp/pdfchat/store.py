@@ -0,0 +1,107 @@
+"""Process-wide cache of loaded FAISS indexes.
+
+Streamlit reruns ``chatapp.py`` for every question, but imported modules persist for
+the life of the server, so the ``index_cache`` below is shared by every session. An
+index is loaded once (memory-mapped by default), together with the BM25 index of its
+chunks, and reused until its directory or the mtime of its files changes on disk. Each
+collection is cached on its own, keyed by its directory; a collection's entry follows
+its published version (see ``pdfchat.namespaces``). Checking for a new version costs a
+read of ``CURRENT`` and two ``stat`` calls; the manifest is only parsed on load.
+"""
+import os
+import threading
+
+from pdfchat import config
+from pdfchat.indexing import MANIFEST, load_manifest, load_vector_store
+from pdfchat.namespaces import resolve_index_dir
+from pdfchat.retrieval import HybridRetriever
+
+
+def index_version(index_dir):
+    """What identifies the index currently on disk, or None if there is none."""
+    index_dir = resolve_index_dir(index_dir)
+    try:
+        mtime = os.stat(os.path.join(index_dir, "index.faiss")).st_mtime_ns
+    except OSError:
+        return None
+    try:
+        manifest_mtime = os.stat(os.path.join(index_dir, MANIFEST)).st_mtime_ns
+    except OSError:
+        manifest_mtime = None
+    return index_dir, manifest_mtime, mtime
+
+
+class IndexCache:
+    """Keeps one loaded vector store (and its hybrid retriever) per index directory."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+        self.loads = 0
+
+    def get(self, index_dir, embeddings):
+        """The loaded store for ``index_dir`` (None if not indexed yet), reloading if stale."""
+        entry = self.entry(index_dir, embeddings)
+        return entry and entry["store"]
+
+    def retriever(self, index_dir, embeddings):
+        """The ``HybridRetriever`` over the current store for ``index_dir``, or None."""
+        entry = self.entry(index_dir, embeddings)
+        return entry and entry["retriever"]
+
+    def entry(self, index_dir, embeddings):
+        """The current index for ``index_dir`` as a dict, or None if not indexed yet.
+
+        Holds the ``store`` and its ``retriever``, the ``version`` (``index_version``) they
+        were loaded from, and the ``embedding_model`` recorded in that version's manifest.
+        """
+        version = index_version(index_dir)
+        if version is None:
+            return None
+        entry = self._entries.get(index_dir)
+        if entry is not None and entry["version"] == version:
+            return entry
+        with self._lock:
+            lock = self._loading.setdefault(index_dir, threading.Lock())
+        # Concurrent sessions asking for the same stale index wait for a single load.
+        with lock:
+            entry = self._entries.get(index_dir)
+            if entry is not None and entry["version"] == version:
+                return entry
+            try:
+                entry = self._load(version, embeddings)
+            except (FileNotFoundError, RuntimeError):
+                # A concurrent publish pruned the version resolved above: load the new one.
+                latest = index_version(index_dir)
+                if latest is None or latest == version:
+                    raise
+                version = latest
+                entry = self._load(version, embeddings)
+            self._entries[index_dir] = entry
+            self.loads += 1
+            return entry
+
+    @staticmethod
+    def _load(version, embeddings):
+        path = version[0]
+        manifest = load_manifest(path)
+        store = load_vector_store(path, embeddings, mmap=config.FAISS_MMAP, kind=manifest.get("index_built", "flat"))
+        if store is None:
+            raise FileNotFoundError(path)
+        return {
+            "version": version,
+            "store": store,
+            "retriever": HybridRetriever(store, keyword_margin=config.KEYWORD_MARGIN),
+            "embedding_model": manifest.get("embedding_model"),
+        }
+
+    def invalidate(self, index_dir=None):
+        with self._lock:
+            if index_dir is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(index_dir, None)
+
+
+index_cache = IndexCache()
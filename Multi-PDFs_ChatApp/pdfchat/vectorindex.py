@@ -0,0 +1,154 @@
+"""FAISS index types and on-disk storage for the chunk vectors.
+
+``flat`` is the exact index LangChain builds by default. For large corpora:
+
+* ``ivf``  - inverted file over ``nlist`` k-means cells, ``nprobe`` cells searched;
+* ``hnsw`` - graph index, no training, fast and accurate but larger in memory;
+* ``pq``   - inverted file with product-quantised vectors (``pq_m`` bytes per vector).
+
+Trained types learn their centroids and codebooks on a random sample of at most
+``PDFCHAT_FAISS_TRAIN_SAMPLE`` vectors. A corpus too small to train them is indexed
+``flat`` until a later rebuild has enough vectors. Only ``flat`` can delete vectors in
+place (the others don't renumber the remaining ids), so removing documents from any
+other type rebuilds it.
+
+Stores are written atomically (temp file, then rename), which lets readers memory-map
+``index.faiss`` read-only: the pages are shared by every process serving the same
+index and are only paged in as they are searched.
+"""
+import math
+import os
+import pickle
+
+import numpy as np
+
+from pdfchat import config
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "pq")
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "index.pkl"
+# faiss wants ~39 training points per centroid; PQ codebooks have 256 centroids.
+POINTS_PER_CENTROID = 39
+MIN_NLIST = 8
+
+
+def _nlist(count):
+    return config.FAISS_NLIST or max(1, min(int(4 * math.sqrt(count)), count // POINTS_PER_CENTROID))
+
+
+def _pq_m(dim):
+    if config.FAISS_PQ_M:
+        return config.FAISS_PQ_M
+    return max(m for m in range(1, dim // 8 + 1) if dim % m == 0)
+
+
+def min_vectors(kind):
+    """Vectors needed before ``kind`` can be trained."""
+    if kind == "ivf":
+        return MIN_NLIST * POINTS_PER_CENTROID
+    if kind == "pq":
+        return 256 * POINTS_PER_CENTROID
+    return 0
+
+
+def supports_delete(kind):
+    return kind == "flat"
+
+
+def tune(index, kind):
+    """Applies the configured search-time parameters to a built or loaded index."""
+    import faiss
+
+    if kind in ("ivf", "pq"):
+        faiss.extract_index_ivf(index).nprobe = config.FAISS_NPROBE
+    elif kind == "hnsw":
+        index.hnsw.efSearch = config.FAISS_EF_SEARCH
+
+
+def new_index(kind, vectors):
+    """An index of type ``kind`` trained on (a sample of) ``vectors``, plus the type built."""
+    import faiss
+
+    count, dim = vectors.shape
+    if count < min_vectors(kind):
+        print(f"{count} vectors are too few to train a {kind} index; using flat")
+        kind = "flat"
+    if kind == "flat":
+        return faiss.IndexFlatL2(dim), kind
+    if kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, config.FAISS_HNSW_M)
+        index.hnsw.efConstruction = config.FAISS_EF_CONSTRUCTION
+    else:
+        spec = f"IVF{_nlist(count)},Flat" if kind == "ivf" else f"IVF{_nlist(count)},PQ{_pq_m(dim)}"
+        index = faiss.index_factory(dim, spec)
+        sample = vectors
+        if count > config.FAISS_TRAIN_SAMPLE:
+            rows = np.random.default_rng(0).choice(count, config.FAISS_TRAIN_SAMPLE, replace=False)
+            sample = vectors[np.sort(rows)]
+        index.train(sample)
+    tune(index, kind)
+    return index, kind
+
+
+def build_vector_store(texts, embeddings, metadatas, ids, kind="flat", vectors=None):
+    """``(store, type built)``: a LangChain FAISS store over ``texts`` on an index of ``kind``.
+
+    ``vectors`` are the texts' embeddings if already computed.
+    """
+    from langchain.docstore.in_memory import InMemoryDocstore
+    from langchain.vectorstores import FAISS
+
+    if vectors is None:
+        vectors = embeddings.embed_documents(texts)
+    index, kind = new_index(kind, np.array(vectors, dtype=np.float32))
+    store = FAISS(embeddings, index, InMemoryDocstore(), {})
+    store.add_embeddings(list(zip(texts, vectors)), metadatas=metadatas, ids=ids)
+    return store, kind
+
+
+def save_vector_store(store, index_dir):
+    """Writes the store like ``FAISS.save_local``, but atomically."""
+    import faiss
+
+    os.makedirs(index_dir, exist_ok=True)
+    index_path = os.path.join(index_dir, INDEX_FILE)
+    docstore_path = os.path.join(index_dir, DOCSTORE_FILE)
+    faiss.write_index(store.index, f"{index_path}.tmp")
+    with open(f"{docstore_path}.tmp", "wb") as f:
+        pickle.dump((store.docstore, store.index_to_docstore_id), f)
+    os.replace(f"{docstore_path}.tmp", docstore_path)
+    os.replace(f"{index_path}.tmp", index_path)
+
+
+def read_index(path, mmap=False):
+    """Reads a FAISS index, memory-mapped read-only when asked and supported by its type."""
+    import faiss
+
+    if mmap:
+        for flags in (getattr(faiss, "IO_FLAG_MMAP_IFC", 0), faiss.IO_FLAG_MMAP):
+            if not flags:
+                continue
+            try:
+                return faiss.read_index(path, flags | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                continue
+        print(f"Could not memory-map {path}; reading it into memory")
+    return faiss.read_index(path)
+
+
+def load_vector_store(index_dir, embeddings, mmap=False, kind="flat"):
+    """The FAISS store saved in ``index_dir``, or None if nothing has been indexed yet.
+
+    A memory-mapped store is read-only: load it without ``mmap`` to update it.
+    """
+    from langchain.vectorstores import FAISS
+
+    index_path = os.path.join(index_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+    index = read_index(index_path, mmap=mmap)
+    tune(index, kind)
+    # Our own pickle, written by save_vector_store or FAISS.save_local.
+    with open(os.path.join(index_dir, DOCSTORE_FILE), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)  # noqa: S301
+    return FAISS(embeddings, index, docstore, index_to_docstore_id)
@@ -1,12 +1,19 @@
 import streamlit as st
-import subprocess
-import time
+import atexit
+import copy
 import urllib
-import base64
 import os
-import requests
+import pandas as pd
 import streamlit.components.v1 as components
 
+from launcher import config
+from launcher.catalog import AGENTS, agent_slug
+from launcher.heartbeat import read_gateway_stats
+from launcher.multipage import SERVER_NAME, server_entry
+from launcher.resources import ResourceMonitor
+from launcher.supervisor import AgentSupervisor
+from launcher.thumbnails import image_data_uri
+
 
 # Must be the first Streamlit command
 st.set_page_config(page_title="NexusAI", page_icon="🤖", layout="wide")
@@ -20,9 +27,8 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state flags
-if "launched_agents" not in st.session_state:
-    st.session_state["launched_agents"] = {}
+# Initialize session state flags (which agents are running is tracked by the supervisor's
+# process-wide registry, not per browser session)
 if "open_url" not in st.session_state:
     st.session_state["open_url"] = None
 if "redirect_done" not in st.session_state:
@@ -38,122 +44,85 @@ if st.session_state["open_url"] and st.session_state["redirect_done"]:
     st.markdown(redirect_js, unsafe_allow_html=True)
     st.stop()
 
-def wait_for_agent(url, timeout=15, interval=1):
-    """Polls the given URL until it returns a successful status or timeout is reached."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            r = requests.get(url)
-            if r.status_code == 200:
-                return True
-        except Exception:
-            pass
-        time.sleep(interval)
-    return False
-
 def launch_agent(agent_name, details):
-    """Launch the specified agent in a new Streamlit process if not already launched."""
-    if not st.session_state["launched_agents"].get(agent_name, False):
-        st.session_state["launched_agents"][agent_name] = True
-        # Launch the agent in a separate process
-        subprocess.Popen(["streamlit", "run", details["script"], "--server.port", str(details["port"])])
-        agent_url = f"http://localhost:{details['port']}"
-        # Wait until the agent is up (using a polling mechanism)
-        if wait_for_agent(agent_url, timeout=15):
-            st.session_state["open_url"] = agent_url
-            st.session_state["redirect_done"] = True
-            st.success(f"{agent_name} is now running at [localhost:{details['port']}]({agent_url})")
+    """Make sure the agent is running (cold-starting it only if needed), then redirect to it."""
+    if config.SINGLE_SERVER:
+        # Every agent is a page of the one shared server.
+        process_name = SERVER_NAME
+        agent_url = f"{supervisor.url(SERVER_NAME)}/{agent_slug(agent_name)}"
+    else:
+        process_name = agent_name
+        agent_url = supervisor.public_url(agent_name)
+    was_running = supervisor.is_alive(process_name)
+    if supervisor.ensure_running(process_name):
+        st.session_state["open_url"] = agent_url
+        st.session_state["redirect_done"] = True
+        if was_running:
+            st.info(f"{agent_name} is already running at [{agent_url}]({agent_url}).")
         else:
-            st.error(f"Timed out waiting for {agent_name} to start. Please check the agent's logs.")
+            ready_in = supervisor.last_start_seconds(process_name) or 0.0
+            st.success(f"{agent_name} is now running at [{agent_url}]({agent_url}) (ready in {ready_in:.1f}s)")
     else:
-        st.info(f"{agent_name} is already running at [localhost:{details['port']}](http://localhost:{details['port']}).")
-
-
-# --- Define AI Agents with Unique Ports, Scripts, Emojis, Image Paths, and Descriptions ---
-agents = {
-    "24/7 AI Chatbot": {
-        "script": "customer_service/app.py", 
-        "port": 8511,
-        "emoji": "🤖",
-        "img": "images/customer-service.jpg",
-        "description": "A dedicated chatbot for customer service inquiries."
-    },
-    "AI Health Assistant": {
-        "script": "medical_diagnostics_agent/app.py", 
-        "port": 8502,
-        "emoji": "💊",
-        "img": "images/health-assistant.jpg",
-        "description": "Provides health advice and medical information."
-    },
-    "Virtual Tutor": {
-        "script": "EduGPT/src/app.py", 
-        "port": 8503,
-        "emoji": "📚",
-        "img": "images/virtual-tutor.jpg",
-        "description": "An intelligent tutor to assist with your learning journey."
-    },
-    "AI Data Visualization Agent": {
-        "script": "Data_Visualization_Agent/ai_data_visualisation_agent.py", 
-        "port": 8504,
-        "emoji": "📊",
-        "img": "images/data-visualization.jpg",
-        "description": "Generates insightful data visualizations on demand."
-    },
-    "Multi-PDFs Chatapp": {
-        "script": "Multi-PDFs_ChatApp/chatapp.py", 
-        "port": 8505,
-        "emoji": "📄",
-        "img": "images/multi-PDFs.jpg",
-        "description": "Chat with ease while processing multiple PDFs."
-    },
-    "Career Assistant": {
-        "script": "career-assistant-agent/app.py", 
-        "port": 8506,
-        "emoji": "💼",
-        "img": "images/career-assistant.jpg",
-        "description": "Get career advice and job search support."
-    },
-    "Smart Farming Assistant": {
-        "script": "KrishiBot/app.py", 
-        "port": 8507,
-        "emoji": "🌱",
-        "img": "images/smart-farming.jpg",
-        "description": "Guidance for modern smart farming techniques."
-    },
-    "AI Travel Agent": {
-        "script": "travel-agent/app.py", 
-        "port": 8508,
-        "emoji": "✈️",
-        "img": "images/travel-agent.jpg",
-        "description": "Tailored travel planning and recommendations."
-    },
-    "Image to Speech GenAI Tool": {
-        "script": "image-to-speech-Agent/app.py", 
-        "port": 8509,
-        "emoji": "🖼️",
-        "img": "images/image-to-speech.jpg",
-        "description": "Converts images into engaging speech descriptions."
-    },
-    "AI Lead Generation": {
-        "script": "lead-generation-agent/ai_lead_generation_agent.py", 
-        "port": 8510,
-        "emoji": "📈",
-        "img": "images/lead-generation.jpg",
-        "description": "Automates lead generation for your business growth."
-    },
-}
+        st.error(f"Timed out waiting for {agent_name} to start. Please check the agent's logs.")
+
+
+# --- AI Agents with Unique Ports, Scripts, Emojis, Image Paths, and Descriptions ---
+agents = copy.deepcopy(AGENTS)
 
 @st.cache_data
-def embed_images_as_base64(agent_dict):
+def embed_images_as_base64(agent_dict, mtimes):
+    """Inline each card image as a small data URI of its cached thumbnail.
+
+    ``mtimes`` is only part of the cache key, so editing an image refreshes its card.
+    """
+    thumbnail_dir = os.path.join(config.STATE_DIR, "thumbnails")
     for name, info in agent_dict.items():
-        ext = os.path.splitext(info["img"])[1].lower()
-        mime = "image/jpeg" if ext in [".jpg", ".jpeg"] else "image/png"
-        with open(info["img"], "rb") as f:
-            encoded = base64.b64encode(f.read()).decode()
-        info["img_base64"] = f"data:{mime};base64,{encoded}"
+        info["img_base64"] = image_data_uri(info["img"], thumbnail_dir)
     return agent_dict
 
-agents = embed_images_as_base64(agents)
+agents = embed_images_as_base64(agents, tuple(os.path.getmtime(info["img"]) for info in agents.values()))
+
+@st.cache_resource
+def get_supervisor():
+    """One supervisor per launcher process, shared by every browser session."""
+    supervised = server_entry(config.SINGLE_SERVER_PORT) if config.SINGLE_SERVER else agents
+    sup = AgentSupervisor(
+        supervised,
+        startup_timeout=config.STARTUP_TIMEOUT,
+        monitor_interval=config.MONITOR_INTERVAL,
+        restart_crashed=config.SUPERVISOR_ENABLED,
+        state_dir=config.STATE_DIR,
+        idle_ttl=config.IDLE_TTL,
+        idle_after=config.IDLE_AFTER,
+        gateway_port=config.GATEWAY_PORT if config.GATEWAY_ENABLED and not config.SINGLE_SERVER else None,
+    )
+    sup.start_gateway()
+    if config.SUPERVISOR_ENABLED:
+        if config.SINGLE_SERVER or config.PRESTART_AGENTS == ["all"]:
+            names = list(supervised)
+        else:
+            names = config.PRESTART_AGENTS
+        sup.prestart(names)
+    sup.start_monitor()
+    atexit.register(sup.stop_all)
+    return sup
+
+supervisor = get_supervisor()
+
+@st.cache_resource
+def get_resource_monitor(_supervisor):
+    """Samples RSS, CPU, threads and connections of every agent process in the background."""
+    monitor = ResourceMonitor(
+        _supervisor,
+        interval=config.RESOURCE_INTERVAL,
+        window=config.RESOURCE_WINDOW,
+        leak_mb_per_min=config.LEAK_MB_PER_MIN,
+        leak_min_growth_mb=config.LEAK_MIN_GROWTH_MB,
+    )
+    monitor.start()
+    return monitor
+
+resource_monitor = get_resource_monitor(supervisor)
 
 # Inject stable CSS for styling
 st.markdown("""
@@ -190,6 +159,16 @@ st.markdown("""
     background-color: #3A506B;
     color: #FFFFFF;
 }
+.card p.state {
+    margin: 0;
+    font-size: 0.8rem;
+    background-color: #3A506B;
+    color: #FFFFFF;
+}
+.state-cold { color: #9AA5B1 !important; }
+.state-starting { color: #F2C14E !important; }
+.state-warm { color: #5FD068 !important; }
+.state-idle { color: #F78154 !important; }
 .card p.description {
     margin: 0;
     padding-bottom: 10px;
@@ -209,12 +188,14 @@ st.markdown("<p style='text-align:center;'>Click on any AI agent card to launch
 # Display cards in rows of 4 columns
 columns = st.columns(4)
 for idx, (agent_name, details) in enumerate(agents.items()):
+    agent_state = supervisor.state(SERVER_NAME if config.SINGLE_SERVER else agent_name)
     with columns[(idx+1) % 4]:
         st.markdown(f"""
         <a href="?agent={urllib.parse.quote(agent_name)}" style="text-decoration: none;" target="_self">
             <div class="card">
                 <img src="{details['img_base64']}" alt="{agent_name}">
                 <h5>{agent_name} {details['emoji']}</h5>
+                <p class="state state-{agent_state}">● {agent_state}</p>
                 <p class="description">{details['description']}</p>
             </div>
         </a>
@@ -229,6 +210,38 @@ if "agent" in query_params:
         # Clear query parameters to avoid re-triggering on rerun
         st.experimental_set_query_params()
 
+# Per-agent process and start-up latency overview
+with st.expander("Agent supervisor"):
+    st.dataframe(supervisor.stats(), use_container_width=True, hide_index=True)
+    gateway_stats = read_gateway_stats(config.STATE_DIR) if supervisor.gateway_port else None
+    if gateway_stats:
+        st.caption(f"Gateway on port {supervisor.gateway_port}: per-route requests and latency to response headers")
+        st.dataframe(
+            [{"route": f"/agent/{slug}/", **route} for slug, route in gateway_stats["routes"].items()],
+            use_container_width=True, hide_index=True,
+        )
+
+# Live resource usage of every running agent
+with st.expander("Agent resources"):
+    if not resource_monitor.available:
+        st.info("Install `psutil` to see per-agent memory, CPU, threads and connections.")
+    else:
+        usage = resource_monitor.latest()
+        if not usage:
+            st.caption("No agent is running yet.")
+        else:
+            for row in usage:
+                if row["leak_suspected"]:
+                    st.error(f"{row['agent']} memory keeps growing ({row['rss_mb']} MB, "
+                             f"+{row['rss_trend_mb_per_min']} MB/min). It may be leaking.")
+            st.dataframe(usage, use_container_width=True, hide_index=True)
+            rss = {
+                name: pd.Series([mb for _, mb in points], index=pd.to_datetime([ts for ts, _ in points], unit="s"))
+                for name, points in resource_monitor.rss_history().items()
+            }
+            st.caption("RSS (MB)")
+            st.line_chart(pd.DataFrame(rss))
+
 # If an agent URL is set (and we haven't already redirected above), do a JavaScript redirect.
 if st.session_state["open_url"] and not st.session_state["redirect_done"]:
     st.session_state["redirect_done"] = True
@@ -0,0 +1,50 @@
+"""Launcher page payload: full-size card images vs. cached thumbnails.
+
+Reports, per card, the size of the inlined data URI that ends up in the page's HTML
+(and therefore on the websocket) with the original JPEG and with the WebP thumbnail,
+plus the time to build all thumbnails cold and to reuse them warm.
+
+Run from the repository root::
+
+    python benchmarks/bench_card_payload.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from launcher.catalog import AGENTS  # noqa: E402
+from launcher.thumbnails import image_data_uri  # noqa: E402
+
+
+def main():
+    cache_dir = tempfile.mkdtemp(prefix="nexusai-thumbs-")
+    try:
+        before = {name: len(image_data_uri(info["img"])) for name, info in AGENTS.items()}
+
+        start = time.perf_counter()
+        after = {name: len(image_data_uri(info["img"], cache_dir)) for name, info in AGENTS.items()}
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for info in AGENTS.values():
+            image_data_uri(info["img"], cache_dir)
+        warm = time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{'card':<32} {'original KB':>12} {'thumbnail KB':>13}")
+    for name in AGENTS:
+        print(f"{name:<32} {before[name] / 1024:>12.1f} {after[name] / 1024:>13.1f}")
+    total_before, total_after = sum(before.values()), sum(after.values())
+    print()
+    print(f"page payload  : {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB "
+          f"({100 * (1 - total_after / total_before):.0f}% smaller)")
+    print(f"thumbnails    : {cold * 1000:.0f} ms to build, {warm * 1000:.1f} ms from cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Memory and start-up benchmark: one process per agent vs. the single multipage server.
+
+Each agent script is executed headlessly with ``streamlit.testing.v1.AppTest``, which
+runs the script (and therefore all of its imports) in-process exactly like a first page
+visit would. Multi-process mode runs every agent in its own interpreter; single-server
+mode runs them all, one after another, in one interpreter.
+
+Run from the repository root::
+
+    python benchmarks/bench_single_server.py [--agents "Multi-PDFs Chatapp,AI Health Assistant"]
+
+Scripts that fail at runtime (missing API keys, etc.) still count: their import cost is
+what this benchmark is about.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from launcher.catalog import AGENTS  # noqa: E402
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_child(scripts, timeout):
+    """Executed in a fresh interpreter: runs ``scripts`` and prints a JSON result line."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    from launcher import multipage
+
+    multipage.prepare(preload=[])
+    per_script = {}
+    for script in scripts:
+        t0 = time.perf_counter()
+        try:
+            AppTest.from_file(os.path.abspath(script), default_timeout=timeout).run()
+        except Exception as e:
+            print(f"{script}: {e}", file=sys.stderr)
+        per_script[script] = time.perf_counter() - t0
+    print(json.dumps({
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": _peak_rss_mb(),
+        "per_script": per_script,
+    }))
+
+
+def _spawn(scripts, timeout):
+    cmd = [sys.executable, __file__, "--child", "--timeout", str(timeout), *scripts]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=False).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", default="", help="comma-separated card names (default: all)")
+    parser.add_argument("--timeout", type=float, default=120, help="per-script AppTest timeout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("scripts", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.scripts, args.timeout)
+        return
+
+    names = [n.strip() for n in args.agents.split(",") if n.strip()] or list(AGENTS)
+    scripts = [AGENTS[name]["script"] for name in names]
+
+    print(f"Benchmarking {len(scripts)} agent(s)...")
+    multi_start = time.perf_counter()
+    multi = [_spawn([script], args.timeout) for script in scripts]
+    multi_seconds = time.perf_counter() - multi_start
+    single_start = time.perf_counter()
+    single = _spawn(scripts, args.timeout)
+    single_seconds = time.perf_counter() - single_start
+
+    print()
+    print(f"{'agent':<32} {'multi RSS MB':>13} {'multi s':>9} {'single s':>9}")
+    for name, script, result in zip(names, scripts, multi):
+        print(f"{name:<32} {result['peak_rss_mb']:>13.1f} {result['seconds']:>9.2f} "
+              f"{single['per_script'][script]:>9.2f}")
+    print()
+    print(f"multi-process : {sum(r['peak_rss_mb'] for r in multi):8.1f} MB total RSS, "
+          f"{multi_seconds:6.2f} s wall (sequential), "
+          f"{sum(r['seconds'] for r in multi):6.2f} s summed start-up")
+    print(f"single server : {single['peak_rss_mb']:8.1f} MB peak RSS,  {single_seconds:6.2f} s wall")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Process management helpers for the NexusAI launcher (root ``app.py``)."""
@@ -0,0 +1,81 @@
+"""The agents shown as launcher cards, shared by every launcher mode."""
+import re
+
+# --- Define AI Agents with Unique Ports, Scripts, Emojis, Image Paths, and Descriptions ---
+AGENTS = {
+    "24/7 AI Chatbot": {
+        "script": "customer_service/app.py", 
+        "port": 8511,
+        "emoji": "🤖",
+        "img": "images/customer-service.jpg",
+        "description": "A dedicated chatbot for customer service inquiries."
+    },
+    "AI Health Assistant": {
+        "script": "medical_diagnostics_agent/app.py", 
+        "port": 8502,
+        "emoji": "💊",
+        "img": "images/health-assistant.jpg",
+        "description": "Provides health advice and medical information."
+    },
+    "Virtual Tutor": {
+        "script": "EduGPT/src/app.py", 
+        "port": 8503,
+        "emoji": "📚",
+        "img": "images/virtual-tutor.jpg",
+        "description": "An intelligent tutor to assist with your learning journey."
+    },
+    "AI Data Visualization Agent": {
+        "script": "Data_Visualization_Agent/ai_data_visualisation_agent.py", 
+        "port": 8504,
+        "emoji": "📊",
+        "img": "images/data-visualization.jpg",
+        "description": "Generates insightful data visualizations on demand."
+    },
+    "Multi-PDFs Chatapp": {
+        "script": "Multi-PDFs_ChatApp/chatapp.py", 
+        "port": 8505,
+        "emoji": "📄",
+        "img": "images/multi-PDFs.jpg",
+        "description": "Chat with ease while processing multiple PDFs."
+    },
+    "Career Assistant": {
+        "script": "career-assistant-agent/app.py", 
+        "port": 8506,
+        "emoji": "💼",
+        "img": "images/career-assistant.jpg",
+        "description": "Get career advice and job search support."
+    },
+    "Smart Farming Assistant": {
+        "script": "KrishiBot/app.py", 
+        "port": 8507,
+        "emoji": "🌱",
+        "img": "images/smart-farming.jpg",
+        "description": "Guidance for modern smart farming techniques."
+    },
+    "AI Travel Agent": {
+        "script": "travel-agent/app.py", 
+        "port": 8508,
+        "emoji": "✈️",
+        "img": "images/travel-agent.jpg",
+        "description": "Tailored travel planning and recommendations."
+    },
+    "Image to Speech GenAI Tool": {
+        "script": "image-to-speech-Agent/app.py", 
+        "port": 8509,
+        "emoji": "🖼️",
+        "img": "images/image-to-speech.jpg",
+        "description": "Converts images into engaging speech descriptions."
+    },
+    "AI Lead Generation": {
+        "script": "lead-generation-agent/ai_lead_generation_agent.py", 
+        "port": 8510,
+        "emoji": "📈",
+        "img": "images/lead-generation.jpg",
+        "description": "Automates lead generation for your business growth."
+    },
+}
+
+
+def agent_slug(name):
+    """URL-safe path segment for an agent card name, e.g. "24/7 AI Chatbot" -> "24-7-ai-chatbot"."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
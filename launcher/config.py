@@ -0,0 +1,51 @@
+"""Launcher settings, read once from the environment (or a ``.env`` file)."""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _names(name, default=""):
+    value = os.getenv(name, default).strip()
+    if not value:
+        return []
+    if value.lower() == "all":
+        return ["all"]
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+# Supervisor mode: pre-start agents at launcher boot and restart them if they crash.
+SUPERVISOR_ENABLED = _flag("NEXUSAI_SUPERVISOR")
+# Which agents to pre-start in supervisor mode: "all" or a comma-separated list of card names.
+PRESTART_AGENTS = _names("NEXUSAI_PRESTART", "all")
+# Seconds to wait for a freshly spawned agent to come up.
+STARTUP_TIMEOUT = float(os.getenv("NEXUSAI_STARTUP_TIMEOUT", "60"))
+# Seconds between crash checks of supervised agents.
+MONITOR_INTERVAL = float(os.getenv("NEXUSAI_MONITOR_INTERVAL", "2"))
+# Single-server mode: serve every agent as a page of one Streamlit server instead of one process each.
+SINGLE_SERVER = _flag("NEXUSAI_SINGLE_SERVER")
+SINGLE_SERVER_PORT = int(os.getenv("NEXUSAI_SINGLE_SERVER_PORT", "8520"))
+# Where the launcher and its agents keep shared runtime state (heartbeats, registry, ...).
+STATE_DIR = os.path.abspath(os.getenv("NEXUSAI_STATE_DIR", ".nexusai"))
+# Stop agents that have seen no activity for this many seconds (0 disables idle reaping).
+IDLE_TTL = float(os.getenv("NEXUSAI_IDLE_TTL", "0"))
+# A running agent with no activity for this many seconds is shown as "idle" rather than "warm".
+IDLE_AFTER = float(os.getenv("NEXUSAI_IDLE_AFTER", "120"))
+# Seconds between heartbeat writes inside each agent process.
+HEARTBEAT_INTERVAL = float(os.getenv("NEXUSAI_HEARTBEAT_INTERVAL", "5"))
+# Gateway mode: expose every agent at http://localhost:<gateway port>/agent/<slug>/ through one proxy.
+GATEWAY_ENABLED = _flag("NEXUSAI_GATEWAY")
+GATEWAY_PORT = int(os.getenv("NEXUSAI_GATEWAY_PORT", "8600"))
+# Resource dashboard: seconds between samples, samples kept per agent, and the memory-leak heuristic.
+RESOURCE_INTERVAL = float(os.getenv("NEXUSAI_RESOURCE_INTERVAL", "5"))
+RESOURCE_WINDOW = int(os.getenv("NEXUSAI_RESOURCE_WINDOW", "720"))
+LEAK_MB_PER_MIN = float(os.getenv("NEXUSAI_LEAK_MB_PER_MIN", "2"))
+LEAK_MIN_GROWTH_MB = float(os.getenv("NEXUSAI_LEAK_MIN_GROWTH_MB", "100"))
@@ -0,0 +1,244 @@
+"""Local reverse-proxy gateway: every agent behind one origin at ``/agent/<slug>/``.
+
+Without the gateway each agent is its own ``localhost:<port>`` origin, so switching
+agents means a new origin, a new websocket and a cold page load. The gateway routes
+``/agent/<slug>/...`` (HTTP and Streamlit's websocket) to the agent's port over a pooled
+keep-alive client, and keeps per-route counters: requests, errors, latency to response
+headers, open websockets and the time of the last request. The counters are served at
+``/_gateway/metrics`` and flushed to ``<state dir>/gateway.json``, where the supervisor
+reads them for idle detection.
+
+Agents must be started with ``--server.baseUrlPath agent/<slug>``, which the supervisor
+does when it is given a ``gateway_port``. Run with::
+
+    python -m launcher.gateway [--port 8600]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from launcher.catalog import AGENTS, agent_slug
+from launcher.heartbeat import STATE_DIR_ENV, gateway_stats_path
+
+PREFIX = "agent"
+METRICS_PATH = "/_gateway/metrics"
+# Headers that describe a single hop and must not be forwarded.
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te",
+    "trailers", "transfer-encoding", "upgrade", "content-length",
+}
+
+
+def route_path(name):
+    """Base URL path of an agent behind the gateway, e.g. ``agent/multi-pdfs-chatapp``."""
+    return f"{PREFIX}/{agent_slug(name)}"
+
+
+class RouteStats:
+    """Request and latency counters for one route."""
+
+    def __init__(self, window=1000):
+        self.requests = 0
+        self.errors = 0
+        self.websockets = 0
+        self.ws_messages = 0
+        self.last_request = None
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds, error=False):
+        self.requests += 1
+        self.errors += int(error)
+        self.last_request = time.time()
+        self.latencies.append(seconds)
+
+    def touch(self):
+        self.ws_messages += 1
+        self.last_request = time.time()
+
+    def snapshot(self):
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            return round(1000 * ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2) if ordered else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "open_websockets": self.websockets,
+            "ws_messages": self.ws_messages,
+            "last_request": self.last_request,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": round(1000 * ordered[-1], 2) if ordered else None,
+        }
+
+
+class Gateway:
+    """aiohttp application that proxies ``/agent/<slug>/`` to each agent's port."""
+
+    def __init__(self, agents=AGENTS, state_dir=None, upstream_host="127.0.0.1",
+                 pool_size=100, flush_interval=2):
+        self.routes = {agent_slug(name): (name, details["port"]) for name, details in agents.items()}
+        self.stats = {slug: RouteStats() for slug in self.routes}
+        self.state_dir = state_dir
+        self.upstream_host = upstream_host
+        self.pool_size = pool_size
+        self.flush_interval = flush_interval
+        self._client = None
+
+    def metrics(self):
+        return {
+            "ts": time.time(),
+            "routes": {
+                slug: {"agent": self.routes[slug][0], **stats.snapshot()}
+                for slug, stats in self.stats.items()
+            },
+        }
+
+    def app(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get(METRICS_PATH, self._metrics)
+        app.router.add_route("*", "/%s/{slug}{tail:.*}" % PREFIX, self._proxy)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def _on_startup(self, app):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+        self._client = aiohttp.ClientSession(
+            connector=connector, auto_decompress=False, timeout=aiohttp.ClientTimeout(total=None)
+        )
+        if self.state_dir:
+            app["flusher"] = asyncio.create_task(self._flush_loop())
+
+    async def _on_cleanup(self, app):
+        if "flusher" in app:
+            app["flusher"].cancel()
+        await self._client.close()
+
+    async def _flush_loop(self):
+        path = gateway_stats_path(self.state_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        while True:
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.metrics(), f)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"Could not write gateway stats: {e}")
+            await asyncio.sleep(self.flush_interval)
+
+    async def _metrics(self, request):
+        from aiohttp import web
+
+        return web.json_response(self.metrics())
+
+    def _upstream_url(self, request, scheme="http"):
+        slug = request.match_info["slug"]
+        port = self.routes[slug][1]
+        return f"{scheme}://{self.upstream_host}:{port}{request.rel_url}"
+
+    async def _proxy(self, request):
+        from aiohttp import web
+
+        slug = request.match_info["slug"]
+        if slug not in self.routes:
+            raise web.HTTPNotFound(text=f"No agent is routed at /{PREFIX}/{slug}/")
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await self._proxy_websocket(request, slug)
+
+        import aiohttp
+
+        stats = self.stats[slug]
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP}
+        started = time.perf_counter()
+        try:
+            upstream = await self._client.request(
+                request.method, self._upstream_url(request), headers=headers,
+                data=request.content if request.can_read_body else None, allow_redirects=False,
+            )
+        except aiohttp.ClientError as e:
+            stats.record(time.perf_counter() - started, error=True)
+            raise web.HTTPBadGateway(text=f"{self.routes[slug][0]} is not reachable: {e}")
+        stats.record(time.perf_counter() - started, error=upstream.status >= 500)
+
+        response = web.StreamResponse(status=upstream.status, reason=upstream.reason)
+        for key, value in upstream.headers.items():
+            if key.lower() not in HOP_BY_HOP:
+                response.headers.add(key, value)
+        await response.prepare(request)
+        async with upstream:
+            async for chunk in upstream.content.iter_chunked(64 * 1024):
+                await response.write(chunk)
+        await response.write_eof()
+        return response
+
+    async def _proxy_websocket(self, request, slug):
+        import aiohttp
+        from aiohttp import web
+
+        stats = self.stats[slug]
+        protocols = [p.strip() for p in request.headers.get("Sec-WebSocket-Protocol", "").split(",") if p.strip()]
+        headers = {k: v for k, v in request.headers.items()
+                   if k.lower() in ("cookie", "origin", "host", "user-agent", "authorization")}
+        started = time.perf_counter()
+        try:
+            upstream = await self._client.ws_connect(
+                self._upstream_url(request, scheme="ws"), protocols=protocols, headers=headers,
+                max_msg_size=0, autoping=True,
+            )
+        except aiohttp.ClientError as e:
+            stats.record(time.perf_counter() - started, error=True)
+            raise web.HTTPBadGateway(text=f"{self.routes[slug][0]} is not reachable: {e}")
+        stats.record(time.perf_counter() - started)
+
+        downstream = web.WebSocketResponse(
+            protocols=[upstream.protocol] if upstream.protocol else (), max_msg_size=0
+        )
+        await downstream.prepare(request)
+        stats.websockets += 1
+
+        async def pump(source, sink):
+            async for msg in source:
+                stats.touch()
+                if msg.type == aiohttp.WSMsgType.BINARY:
+                    await sink.send_bytes(msg.data)
+                elif msg.type == aiohttp.WSMsgType.TEXT:
+                    await sink.send_str(msg.data)
+                else:
+                    break
+            await sink.close()
+
+        try:
+            await asyncio.gather(pump(downstream, upstream), pump(upstream, downstream),
+                                 return_exceptions=True)
+        finally:
+            stats.websockets -= 1
+            await upstream.close()
+        return downstream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NexusAI agent gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("NEXUSAI_GATEWAY_PORT", "8600")))
+    args = parser.parse_args(argv)
+    try:
+        from aiohttp import web
+    except ImportError:
+        sys.exit("The gateway needs aiohttp: pip install aiohttp")
+    gateway = Gateway(state_dir=os.getenv(STATE_DIR_ENV))
+    web.run_app(gateway.app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Agent heartbeats: each agent process records when it was last used.
+
+``launcher.run_agent`` starts a ``HeartbeatWriter`` inside the agent once its server is
+up. It counts every script run (page load or widget interaction) as activity and
+periodically writes ``<state dir>/heartbeats/<agent slug>.json``. When the gateway is in
+use, its per-route request times (``<state dir>/gateway.json``) count as activity too.
+The supervisor reads both to decide which agents are idle and can be stopped.
+"""
+import json
+import os
+import threading
+import time
+
+from launcher.catalog import agent_slug
+
+STATE_DIR_ENV = "NEXUSAI_STATE_DIR"
+
+
+def heartbeat_path(state_dir, name):
+    return os.path.join(state_dir, "heartbeats", f"{agent_slug(name)}.json")
+
+
+def gateway_stats_path(state_dir):
+    return os.path.join(state_dir, "gateway.json")
+
+
+def read_gateway_stats(state_dir):
+    """Per-route counters last flushed by ``launcher.gateway`` (None without a gateway)."""
+    try:
+        with open(gateway_stats_path(state_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_heartbeat(state_dir, name):
+    """Returns the last heartbeat written by ``name`` or None if there is none yet."""
+    try:
+        with open(heartbeat_path(state_dir, name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class HeartbeatWriter:
+    """Runs inside an agent process and persists its activity every ``interval`` seconds."""
+
+    def __init__(self, state_dir, name, interval=5):
+        self.path = heartbeat_path(state_dir, name)
+        self.interval = interval
+        self.last_active = time.time()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def touch(self):
+        self.last_active = time.time()
+
+    def start(self):
+        self._hook_reruns()
+        threading.Thread(target=self._loop, name="agent-heartbeat", daemon=True).start()
+
+    def _hook_reruns(self):
+        """Counts every rerun request (page load, widget change) as activity."""
+        try:
+            from streamlit.runtime.app_session import AppSession
+        except ImportError:
+            return
+        original = AppSession.request_rerun
+        writer = self
+
+        def request_rerun(self, *args, **kwargs):
+            writer.touch()
+            return original(self, *args, **kwargs)
+
+        AppSession.request_rerun = request_rerun
+
+    def _sessions(self):
+        try:
+            from streamlit.runtime import Runtime
+            return Runtime.instance()._session_mgr.num_active_sessions()
+        except Exception:
+            return None
+
+    def _loop(self):
+        while True:
+            beat = {
+                "pid": os.getpid(),
+                "ts": time.time(),
+                "last_active": self.last_active,
+                "sessions": self._sessions(),
+            }
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(beat, f)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"Could not write heartbeat: {e}")
+            time.sleep(self.interval)
@@ -0,0 +1,97 @@
+"""Single-server mode: every agent script mounted as a page of one Streamlit server.
+
+In the default mode each agent runs in its own interpreter, so langchain, openai,
+transformers and friends are imported (and held in memory) once per agent. Here the
+scripts share one interpreter: heavy modules are imported once, optionally ahead of the
+first visit, and every page reuses them from ``sys.modules``.
+"""
+import importlib
+import os
+import runpy
+import sys
+import threading
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from launcher.catalog import AGENTS, agent_slug
+
+# How the supervisor knows the single server: one pseudo-agent running the multipage entrypoint.
+SERVER_NAME = "NexusAI single server"
+SERVER_SCRIPT = "multipage_app.py"
+
+# Imported in the background when the server starts so the first page visit is warm.
+PRELOAD_MODULES = [
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_community",
+    "langchain_google_genai",
+    "openai",
+    "transformers",
+    "pandas",
+]
+
+_prepared = False
+_prepare_lock = threading.Lock()
+
+
+def _tolerant_set_page_config(original):
+    """Agent scripts each call ``st.set_page_config``; only the first call of a run may win."""
+    def set_page_config(*args, **kwargs):
+        try:
+            return original(*args, **kwargs)
+        except StreamlitAPIException:
+            return None
+    set_page_config.__wrapped__ = original
+    return set_page_config
+
+
+def prepare(agents=AGENTS, preload=PRELOAD_MODULES):
+    """One-time process setup: agent import paths, page-config patch and module preload."""
+    global _prepared
+    with _prepare_lock:
+        if _prepared:
+            return
+        # Agent scripts import their sibling modules (``workflow``, ``Utils.Agents``,
+        # ``agents.agent``...), exactly as ``streamlit run <script>`` would allow.
+        for details in agents.values():
+            script_dir = os.path.abspath(os.path.dirname(details["script"]))
+            if script_dir not in sys.path:
+                sys.path.insert(0, script_dir)
+        if not hasattr(st.set_page_config, "__wrapped__"):
+            st.set_page_config = _tolerant_set_page_config(st.set_page_config)
+        threading.Thread(target=_preload, args=(list(preload),), name="module-preload", daemon=True).start()
+        _prepared = True
+
+
+def _preload(modules):
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"Preload of {module} skipped: {e}")
+
+
+def _agent_page(script):
+    def run():
+        runpy.run_path(script, run_name="__main__")
+    return run
+
+
+def server_entry(port):
+    """Supervisor catalog entry for the single server listening on ``port``."""
+    return {SERVER_NAME: {"script": SERVER_SCRIPT, "port": port}}
+
+
+def build_pages(agents=AGENTS):
+    """Returns one ``st.Page`` per agent card, reachable at ``/<agent slug>``."""
+    return [
+        st.Page(
+            _agent_page(details["script"]),
+            title=name,
+            icon=details["emoji"],
+            url_path=agent_slug(name),
+        )
+        for name, details in agents.items()
+    ]
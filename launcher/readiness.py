@@ -0,0 +1,107 @@
+"""Agent readiness: a local "ready" socket with a pooled HTTP health probe as fallback.
+
+Agents started through ``launcher.run_agent`` connect back to the launcher's
+``ReadyListener`` the moment their Streamlit server is listening, so the launcher wakes
+up immediately instead of polling. Agents that cannot signal (older Streamlit, a process
+started by hand) are still detected by probing ``/_stcore/health`` with exponential
+backoff over a single keep-alive session.
+"""
+import os
+import socket
+import threading
+import time
+
+import requests
+
+READY_ADDR_ENV = "NEXUSAI_READY_ADDR"
+AGENT_NAME_ENV = "NEXUSAI_AGENT_NAME"
+HEALTH_PATH = "/_stcore/health"
+
+# One pooled session for every probe, so repeated checks reuse their TCP connection.
+_session = requests.Session()
+
+
+def probe(url, timeout=1.0):
+    """Returns True if the Streamlit server at ``url`` answers its health endpoint."""
+    try:
+        return _session.get(url.rstrip("/") + HEALTH_PATH, timeout=timeout).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+class ReadyListener:
+    """Accepts ``READY <agent name>`` messages from agent processes on a loopback socket."""
+
+    def __init__(self, host="127.0.0.1"):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind((host, 0))
+        self._sock.listen(16)
+        self.address = "%s:%d" % self._sock.getsockname()
+        self._events = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._serve, name="agent-ready-listener", daemon=True).start()
+
+    def event(self, name):
+        with self._lock:
+            return self._events.setdefault(name, threading.Event())
+
+    def reset(self, name):
+        """Forgets a previous signal; call right before (re)spawning ``name``."""
+        self.event(name).clear()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            with conn:
+                conn.settimeout(2)
+                try:
+                    message = conn.recv(1024).decode("utf-8", "replace").strip()
+                except OSError:
+                    continue
+            if message.startswith("READY "):
+                self.event(message[len("READY "):]).set()
+
+    def close(self):
+        self._sock.close()
+
+
+def signal_ready(name=None, address=None):
+    """Called from inside an agent process once its server is listening."""
+    address = address or os.getenv(READY_ADDR_ENV)
+    name = name or os.getenv(AGENT_NAME_ENV)
+    if not address or not name:
+        return False
+    host, port = address.rsplit(":", 1)
+    try:
+        with socket.create_connection((host, int(port)), timeout=2) as conn:
+            conn.sendall(f"READY {name}\n".encode("utf-8"))
+        return True
+    except OSError:
+        return False
+
+
+def wait_for_agent(url, timeout=15, ready_event=None, initial_delay=0.05, max_delay=1.0):
+    """Blocks until the agent at ``url`` is ready or ``timeout`` seconds have passed.
+
+    Waits on ``ready_event`` (set by the ``ReadyListener``) and, between waits, falls back
+    to a health probe whose interval doubles from ``initial_delay`` up to ``max_delay``.
+    Returns ``(ready, how, seconds)`` where ``how`` is ``"signal"``, ``"probe"`` or None.
+    """
+    start = time.time()
+    deadline = start + timeout
+    delay = initial_delay
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False, None, time.time() - start
+        if ready_event is not None:
+            if ready_event.wait(min(delay, remaining)):
+                return True, "signal", time.time() - start
+        else:
+            time.sleep(min(delay, remaining))
+        if probe(url):
+            return True, "probe", time.time() - start
+        delay = min(delay * 2, max_delay)
@@ -0,0 +1,148 @@
+"""Process-wide launch registry shared by every launcher session and launcher process.
+
+One SQLite row per agent records who owns its port: the agent's PID, port, start time,
+health and the PID of the launcher that spawned it. ``claim`` runs inside a
+``BEGIN IMMEDIATE`` transaction, so of several concurrent launch requests for the same
+agent exactly one is told to spawn; the rest wait for that process instead of starting
+a duplicate on the same port. Rows whose processes have died are detected by PID
+liveness and reclaimed.
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    name TEXT PRIMARY KEY,
+    port INTEGER NOT NULL,
+    pid INTEGER,
+    owner_pid INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    health TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+# Outcomes of ``Registry.claim``.
+SPAWN = "spawn"
+RUNNING = "running"
+STARTING = "starting"
+
+
+def pid_alive(pid):
+    """True if a process with this PID exists (without signalling it)."""
+    if not pid:
+        return False
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Registry:
+    """SQLite-backed table of running agents. Safe to use from any thread or process."""
+
+    def __init__(self, path, claim_timeout=60):
+        self.path = path
+        self.claim_timeout = claim_timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, name):
+        """Returns the live entry for ``name`` as a dict, or None if absent or stale."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM agents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        if pid_alive(entry["pid"]) or (entry["pid"] is None and self._spawn_pending(entry)):
+            return entry
+        return None
+
+    def entries(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM agents ORDER BY name").fetchall()
+        return [dict(row) for row in rows]
+
+    def _spawn_pending(self, entry):
+        """Someone claimed the agent and is still within its start-up window."""
+        return (
+            pid_alive(entry["owner_pid"])
+            and time.time() - entry["updated_at"] < self.claim_timeout
+        )
+
+    def claim(self, name, port):
+        """Decides who starts ``name``.
+
+        Returns ``(SPAWN, None)`` if the caller now owns the agent and must spawn it,
+        ``(RUNNING, entry)`` if a live process already serves it, or
+        ``(STARTING, entry)`` if another caller is spawning it right now.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM agents WHERE name = ?", (name,)).fetchone()
+            if row is not None:
+                entry = dict(row)
+                if pid_alive(entry["pid"]):
+                    conn.execute("COMMIT")
+                    return (RUNNING if entry["health"] == "ready" else STARTING), entry
+                if entry["pid"] is None and self._spawn_pending(entry):
+                    conn.execute("COMMIT")
+                    return STARTING, entry
+            # Absent or stale (its process is gone): take ownership.
+            conn.execute(
+                "INSERT OR REPLACE INTO agents (name, port, pid, owner_pid, started_at, health, updated_at) "
+                "VALUES (?, ?, NULL, ?, ?, 'starting', ?)",
+                (name, port, os.getpid(), now, now),
+            )
+            conn.execute("COMMIT")
+            return SPAWN, None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def record_spawn(self, name, pid):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE agents SET pid = ?, started_at = ?, updated_at = ? WHERE name = ? AND owner_pid = ?",
+                (pid, time.time(), time.time(), name, os.getpid()),
+            )
+
+    def set_health(self, name, health):
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE agents SET health = ?, updated_at = ? WHERE name = ?",
+                (health, time.time(), name),
+            )
+
+    def release(self, name, pid=None):
+        """Drops the entry for ``name`` (only if it still belongs to ``pid``, when given)."""
+        with closing(self._connect()) as conn:
+            if pid is None:
+                conn.execute("DELETE FROM agents WHERE name = ? AND owner_pid = ?", (name, os.getpid()))
+            else:
+                conn.execute("DELETE FROM agents WHERE name = ? AND pid = ?", (name, pid))
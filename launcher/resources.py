@@ -0,0 +1,149 @@
+"""Per-agent resource sampling for the launcher's resource dashboard.
+
+A background thread samples every agent process known to the supervisor (RSS, CPU%,
+threads, open connections) and keeps a rolling history per agent. An agent is flagged
+as leaking when, over the recent window, its RSS climbs steadily: the least-squares
+slope exceeds ``leak_mb_per_min``, the net growth exceeds ``leak_min_growth_mb`` and
+most consecutive samples go up. Requires ``psutil``; without it the monitor stays idle.
+"""
+import threading
+import time
+from collections import deque
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def rss_slope_mb_per_min(samples):
+    """Least-squares slope of RSS over time, in MB per minute."""
+    if len(samples) < 2:
+        return 0.0
+    xs = [s["ts"] for s in samples]
+    ys = [s["rss_mb"] for s in samples]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return 60 * cov / var
+
+
+class ResourceMonitor:
+    """Samples agent processes every ``interval`` seconds and keeps ``window`` samples each."""
+
+    def __init__(self, supervisor, interval=5, window=720, leak_window=60,
+                 leak_mb_per_min=2.0, leak_min_growth_mb=100):
+        self.supervisor = supervisor
+        self.interval = interval
+        self.leak_window = leak_window
+        self.leak_mb_per_min = leak_mb_per_min
+        self.leak_min_growth_mb = leak_min_growth_mb
+        self.history = {name: deque(maxlen=window) for name in supervisor.agents}
+        self._procs = {}
+        self._flagged = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def available(self):
+        return psutil is not None
+
+    def start(self):
+        if not self.available or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="agent-resources", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while True:
+            self.sample()
+            time.sleep(self.interval)
+
+    def _process(self, name, pid):
+        proc = self._procs.get(name)
+        if proc is None or proc.pid != pid:
+            proc = psutil.Process(pid)
+            proc.cpu_percent(None)  # prime: the first call always returns 0.0
+            self._procs[name] = proc
+            with self._lock:
+                self.history[name].clear()  # new process, new baseline
+        return proc
+
+    def sample(self):
+        now = time.time()
+        for name in self.supervisor.agents:
+            pid = self.supervisor.pid(name)
+            if not pid:
+                self._procs.pop(name, None)
+                with self._lock:
+                    self.history[name].clear()
+                continue
+            try:
+                proc = self._process(name, pid)
+                with proc.oneshot():
+                    connections = proc.net_connections() if hasattr(proc, "net_connections") else proc.connections()
+                    sample = {
+                        "ts": now,
+                        "pid": pid,
+                        "rss_mb": proc.memory_info().rss / (1024 * 1024),
+                        "cpu_percent": proc.cpu_percent(None),
+                        "threads": proc.num_threads(),
+                        "connections": len(connections),
+                    }
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._procs.pop(name, None)
+                continue
+            with self._lock:
+                self.history[name].append(sample)
+            if self.is_leaking(name):
+                if name not in self._flagged:
+                    self._flagged.add(name)
+                    print(f"{name} (pid {pid}) memory keeps growing: {sample['rss_mb']:.0f} MB RSS.")
+            else:
+                self._flagged.discard(name)
+
+    def is_leaking(self, name):
+        with self._lock:
+            recent = list(self.history[name])[-self.leak_window:]
+        if len(recent) < max(3, self.leak_window // 2):
+            return False
+        growth = recent[-1]["rss_mb"] - min(s["rss_mb"] for s in recent)
+        rising = sum(b["rss_mb"] > a["rss_mb"] for a, b in zip(recent, recent[1:])) / (len(recent) - 1)
+        return (
+            rss_slope_mb_per_min(recent) > self.leak_mb_per_min
+            and growth > self.leak_min_growth_mb
+            and rising >= 0.6
+        )
+
+    def latest(self):
+        """One row per running agent: its latest sample, growth trend and leak flag."""
+        rows = []
+        for name in self.supervisor.agents:
+            with self._lock:
+                samples = list(self.history[name])
+            if not samples:
+                continue
+            last = samples[-1]
+            recent = samples[-self.leak_window:]
+            rows.append({
+                "agent": name,
+                "pid": last["pid"],
+                "rss_mb": round(last["rss_mb"], 1),
+                "peak_rss_mb": round(max(s["rss_mb"] for s in samples), 1),
+                "cpu_percent": round(last["cpu_percent"], 1),
+                "threads": last["threads"],
+                "connections": last["connections"],
+                "rss_trend_mb_per_min": round(rss_slope_mb_per_min(recent), 2),
+                "leak_suspected": self.is_leaking(name),
+            })
+        return rows
+
+    def rss_history(self):
+        """``{agent: [(timestamp, rss_mb), ...]}`` for charting."""
+        with self._lock:
+            return {
+                name: [(s["ts"], s["rss_mb"]) for s in samples]
+                for name, samples in self.history.items() if samples
+            }
@@ -0,0 +1,55 @@
+"""Runs one agent script under Streamlit and tells the launcher when its server is up.
+
+Usage (spawned by the supervisor, not meant to be typed by hand)::
+
+    python -m launcher.run_agent <script.py> [streamlit options...]
+
+The launcher passes its ready-socket address, the agent's card name and its state
+directory through the ``NEXUSAI_READY_ADDR`` / ``NEXUSAI_AGENT_NAME`` /
+``NEXUSAI_STATE_DIR`` environment variables. Once the server is up the agent also starts
+writing heartbeats (see ``launcher.heartbeat``) so idle agents can be stopped.
+"""
+import os
+import sys
+
+from launcher import config
+from launcher.heartbeat import STATE_DIR_ENV, HeartbeatWriter
+from launcher.readiness import AGENT_NAME_ENV, signal_ready
+
+
+def _start_heartbeat():
+    state_dir, name = os.getenv(STATE_DIR_ENV), os.getenv(AGENT_NAME_ENV)
+    if state_dir and name:
+        HeartbeatWriter(state_dir, name, interval=config.HEARTBEAT_INTERVAL).start()
+
+
+def _hook_server_start():
+    """Wraps ``Server.start`` so the ready signal fires as soon as the port is bound."""
+    try:
+        from streamlit.web.server import Server
+    except ImportError:
+        return False
+    original_start = Server.start
+
+    async def start(self, *args, **kwargs):
+        result = await original_start(self, *args, **kwargs)
+        signal_ready()
+        _start_heartbeat()
+        return result
+
+    Server.start = start
+    return True
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        sys.exit("usage: python -m launcher.run_agent <script.py> [streamlit options...]")
+    if not _hook_server_start():
+        print("Could not hook the Streamlit server; the launcher will fall back to probing.")
+    from streamlit.web.cli import main as streamlit_main
+    streamlit_main(["run", *argv], prog_name="streamlit")
+
+
+if __name__ == "__main__":
+    main()
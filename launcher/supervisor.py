@@ -0,0 +1,321 @@
+"""Spawns, tracks and restarts the Streamlit agent processes behind the launcher cards."""
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from launcher import heartbeat, readiness, registry
+from launcher.catalog import agent_slug
+from launcher.gateway import route_path
+
+logger = logging.getLogger(__name__)
+
+# Registry name of the gateway process, which is shared like an agent.
+GATEWAY_NAME = "__gateway__"
+
+
+class AgentSupervisor:
+    """Owns one Streamlit process per agent and keeps latency stats for each of them.
+
+    A single instance is shared by every launcher session, and launches are coordinated
+    with other launcher processes through the SQLite ``registry`` in ``state_dir``: an
+    agent that is already running, or being started elsewhere, is waited on rather
+    than spawned a second time on the same port. When ``restart_crashed`` is
+    set, a monitor thread respawns agents whose process exits unexpectedly; when
+    ``idle_ttl`` is set, the same thread stops agents whose heartbeat shows no activity
+    for that many seconds. A stopped agent is cold-started again on its next launch.
+    """
+
+    def __init__(self, agents, startup_timeout=60, monitor_interval=2, restart_crashed=False,
+                 state_dir=".nexusai", idle_ttl=0, idle_after=120, gateway_port=None):
+        self.agents = agents
+        self.gateway_port = gateway_port
+        self.startup_timeout = startup_timeout
+        self.monitor_interval = monitor_interval
+        self.restart_crashed = restart_crashed
+        self.state_dir = state_dir
+        self.idle_ttl = idle_ttl
+        self.idle_after = idle_after
+        self._lock = threading.RLock()
+        self._procs = {}
+        self._ready = {}
+        self._touched = {}
+        self._gateway = None
+        self._stats = {
+            name: {"cold_starts": [], "warm_starts": [], "ready_via": None, "restarts": 0,
+                   "failures": 0, "reaped": 0}
+            for name in agents
+        }
+        self._stopping = threading.Event()
+        self._monitor = None
+        self._listener = readiness.ReadyListener()
+        self.registry = registry.Registry(
+            os.path.join(state_dir, "registry.sqlite3"), claim_timeout=startup_timeout
+        )
+
+    # --- lifecycle -------------------------------------------------------------------
+
+    def url(self, name):
+        """Where the agent's own server listens (used for health checks)."""
+        base = f"http://localhost:{self.agents[name]['port']}"
+        return f"{base}/{route_path(name)}" if self.gateway_port else base
+
+    def public_url(self, name):
+        """Where users are sent: the gateway route if there is one, else the agent's port."""
+        if self.gateway_port:
+            return f"http://localhost:{self.gateway_port}/{route_path(name)}/"
+        return self.url(name)
+
+    def owns(self, name):
+        """True if ``name`` is a live process spawned by this supervisor."""
+        proc = self._procs.get(name)
+        return proc is not None and proc.poll() is None
+
+    def pid(self, name):
+        if self.owns(name):
+            return self._procs[name].pid
+        entry = self.registry.get(name)
+        return entry["pid"] if entry else None
+
+    def is_alive(self, name):
+        """True if ``name`` runs anywhere: spawned here or by another launcher process."""
+        return self.owns(name) or self.pid(name) is not None
+
+    def _spawn(self, name):
+        details = self.agents[name]
+        env = dict(os.environ)
+        env[readiness.READY_ADDR_ENV] = self._listener.address
+        env[readiness.AGENT_NAME_ENV] = name
+        env[heartbeat.STATE_DIR_ENV] = self.state_dir
+        self._listener.reset(name)
+        cmd = [
+            sys.executable, "-m", "launcher.run_agent", details["script"],
+            "--server.port", str(details["port"]),
+            "--server.headless", "true",
+        ]
+        if self.gateway_port:
+            cmd += ["--server.baseUrlPath", route_path(name)]
+        return subprocess.Popen(cmd, env=env)
+
+    def start(self, name):
+        """Spawns ``name`` (if it is not already running) and blocks until it is ready.
+
+        Returns True once the agent answers on its port. Concurrent callers for the same
+        agent share one spawn and wait on the same readiness event.
+        """
+        with self._lock:
+            if self.owns(name) and name in self._ready:
+                event, action = self._ready[name], None
+            else:
+                action, _ = self.registry.claim(name, self.agents[name]["port"])
+                if action == registry.SPAWN:
+                    event = threading.Event()
+                    self._ready[name] = event
+                    spawned_at = time.time()
+                    try:
+                        proc = self._spawn(name)
+                    except OSError:
+                        self.registry.release(name)
+                        raise
+                    self._procs[name] = proc
+                    self.registry.record_spawn(name, proc.pid)
+        if action is None:
+            return event.wait(self.startup_timeout) and self.owns(name)
+        if action != registry.SPAWN:
+            # Another launcher process owns this agent: wait for it instead of spawning.
+            ok, _, _ = readiness.wait_for_agent(self.url(name), timeout=self.startup_timeout)
+            return ok
+
+        ok, how, _ = readiness.wait_for_agent(
+            self.url(name), timeout=self.startup_timeout, ready_event=self._listener.event(name)
+        )
+        self.registry.set_health(name, "ready" if ok else "unhealthy")
+        with self._lock:
+            if ok:
+                self._touched[name] = time.time()
+                self._stats[name]["cold_starts"].append(time.time() - spawned_at)
+                self._stats[name]["ready_via"] = how
+            else:
+                self._stats[name]["failures"] += 1
+        if not ok:
+            # Don't leave a process that never became ready looking warm to state() and
+            # the monitor; the next launch starts it from scratch.
+            logger.warning("%s was not ready after %.0fs; stopping it.", name, self.startup_timeout)
+            self.stop(name)
+        event.set()
+        return ok and self.owns(name)
+
+    def ensure_running(self, name):
+        """Returns True when ``name`` is serving, cold-starting it only if needed.
+
+        For an agent that is already up this costs a single health probe, which is
+        recorded as the warm-start latency.
+        """
+        self._touched[name] = time.time()
+        started = time.time()
+        event = self._ready.get(name)
+        if self.owns(name) and event is not None:
+            if not event.wait(self.startup_timeout):
+                return False
+        else:
+            entry = self.registry.get(name)
+            if not (entry and entry["pid"] and entry["health"] == "ready"):
+                return self.start(name)
+        if not readiness.probe(self.url(name)):
+            return False
+        with self._lock:
+            self._stats[name]["warm_starts"].append(time.time() - started)
+        return True
+
+    def prestart(self, names):
+        """Starts the given agents in parallel background threads without blocking."""
+        for name in names:
+            if name in self.agents:
+                threading.Thread(target=self.start, args=(name,), daemon=True).start()
+        self.start_monitor()
+
+    def stop(self, name):
+        with self._lock:
+            proc = self._procs.pop(name, None)
+            self._ready.pop(name, None)
+        if proc is None:
+            return
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        self.registry.release(name, proc.pid)
+
+    def stop_all(self):
+        self._stopping.set()
+        for name in list(self._procs):
+            self.stop(name)
+        if self._gateway is not None:
+            self._gateway.terminate()
+            self.registry.release(GATEWAY_NAME, self._gateway.pid)
+        self._listener.close()
+
+    def start_gateway(self):
+        """Starts the shared ``launcher.gateway`` process unless one is already running."""
+        if not self.gateway_port or self._gateway is not None:
+            return
+        action, _ = self.registry.claim(GATEWAY_NAME, self.gateway_port)
+        if action != registry.SPAWN:
+            return
+        env = dict(os.environ)
+        env[heartbeat.STATE_DIR_ENV] = self.state_dir
+        self._gateway = subprocess.Popen(
+            [sys.executable, "-m", "launcher.gateway", "--port", str(self.gateway_port)], env=env
+        )
+        self.registry.record_spawn(GATEWAY_NAME, self._gateway.pid)
+        self.registry.set_health(GATEWAY_NAME, "ready")
+
+    def last_start_seconds(self, name):
+        """Time-to-ready of the most recent cold start of ``name``, if any."""
+        cold = self._stats[name]["cold_starts"]
+        return cold[-1] if cold else None
+
+    # --- activity ----------------------------------------------------------------------
+
+    def last_activity(self, name):
+        """Latest of: the agent's own heartbeat, gateway traffic, its last launch or cold start."""
+        latest = self._touched.get(name, 0)
+        beat = heartbeat.read_heartbeat(self.state_dir, name)
+        if beat and beat.get("pid") == self.pid(name):
+            latest = max(latest, beat.get("last_active", 0))
+        if self.gateway_port:
+            routes = (heartbeat.read_gateway_stats(self.state_dir) or {}).get("routes", {})
+            latest = max(latest, routes.get(agent_slug(name), {}).get("last_request") or 0)
+        return latest
+
+    def active_sessions(self, name):
+        """Browser sessions connected to ``name`` at its last heartbeat (0 if unknown)."""
+        beat = heartbeat.read_heartbeat(self.state_dir, name)
+        if not beat or beat.get("pid") != self.pid(name):
+            return 0
+        return beat.get("sessions") or 0
+
+    def state(self, name):
+        """One of ``cold``, ``starting``, ``warm`` or ``idle``."""
+        if self.owns(name):
+            event = self._ready.get(name)
+            if event is None or not event.is_set():
+                return "starting"
+        else:
+            entry = self.registry.get(name)
+            if entry is None:
+                return "cold"
+            if not entry["pid"] or entry["health"] != "ready":
+                return "starting"
+        if time.time() - self.last_activity(name) > self.idle_after:
+            return "idle"
+        return "warm"
+
+    def _reap_idle(self):
+        now = time.time()
+        for name in list(self._procs):
+            if self.state(name) not in ("warm", "idle"):
+                continue
+            idle_for = now - self.last_activity(name)
+            # An agent with a tab still open is kept: stopping it would drop that session.
+            if idle_for <= self.idle_ttl or self.active_sessions(name):
+                continue
+            logger.info("%s idle for %.0fs; stopping it until the next launch.", name, idle_for)
+            self.stop(name)
+            with self._lock:
+                self._stats[name]["reaped"] += 1
+
+    # --- monitor thread --------------------------------------------------------------
+
+    def start_monitor(self):
+        if not (self.restart_crashed or self.idle_ttl) or self._monitor is not None:
+            return
+        self._monitor = threading.Thread(target=self._watch, name="agent-supervisor", daemon=True)
+        self._monitor.start()
+
+    def _watch(self):
+        while not self._stopping.wait(self.monitor_interval):
+            if self.idle_ttl:
+                self._reap_idle()
+            if not self.restart_crashed:
+                continue
+            for name, proc in list(self._procs.items()):
+                if proc.poll() is None or self._stopping.is_set():
+                    continue
+                event = self._ready.get(name)
+                if event is not None and not event.is_set():
+                    continue  # still inside start(); it reports its own failure
+                logger.warning("%s exited with code %s; restarting...", name, proc.returncode)
+                with self._lock:
+                    self._stats[name]["restarts"] += 1
+                    self._ready.pop(name, None)
+                threading.Thread(target=self.start, args=(name,), daemon=True).start()
+
+    # --- reporting -------------------------------------------------------------------
+
+    def stats(self):
+        """Returns one row per agent with PID, state, idle time and cold/warm start latencies."""
+        rows = []
+        with self._lock:
+            for name, stat in self._stats.items():
+                cold, warm = stat["cold_starts"], stat["warm_starts"]
+                state = self.state(name)
+                idle_for = time.time() - self.last_activity(name) if state in ("warm", "idle") else None
+                rows.append({
+                    "agent": name,
+                    "pid": self.pid(name),
+                    "owned": self.owns(name),
+                    "state": state,
+                    "idle_s": round(idle_for) if idle_for is not None else None,
+                    "cold_start_s": round(cold[-1], 2) if cold else None,
+                    "ready_via": stat["ready_via"],
+                    "warm_start_s": round(sum(warm) / len(warm), 3) if warm else None,
+                    "restarts": stat["restarts"],
+                    "failures": stat["failures"],
+                    "reaped": stat["reaped"],
+                })
+        return rows
@@ -0,0 +1,55 @@
+"""Card thumbnails: each card image is resized once and cached on disk.
+
+The launcher used to inline every full-size JPEG from ``images/`` as a base64 data URI
+on each page load. Thumbnails are sized for the card (350x150 CSS pixels, rendered at
+2x for high-DPI screens), stored as WebP, and cached under a key derived from the
+source path and mtime, so editing an image regenerates just that one thumbnail.
+"""
+import base64
+import hashlib
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow ships with Streamlit, but keep the launcher usable without it.
+    Image = None
+
+CARD_SIZE = (700, 300)
+FORMAT = "WEBP"
+MIME = "image/webp"
+QUALITY = 80
+
+
+def _mime_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    return "image/jpeg" if ext in [".jpg", ".jpeg"] else "image/png"
+
+
+def thumbnail_path(src, cache_dir, size=CARD_SIZE):
+    """Returns the cached thumbnail for ``src``, generating it first if needed."""
+    stat = os.stat(src)
+    key = hashlib.sha1(
+        f"{os.path.abspath(src)}:{stat.st_mtime_ns}:{size[0]}x{size[1]}:{QUALITY}".encode("utf-8")
+    ).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(src))[0]
+    path = os.path.join(cache_dir, f"{stem}-{key}.{FORMAT.lower()}")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        with Image.open(src) as img:
+            img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+            img.thumbnail(size, Image.LANCZOS)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            img.save(tmp, FORMAT, quality=QUALITY, method=6)
+        os.replace(tmp, path)
+    return path
+
+
+def image_data_uri(src, cache_dir=None, size=CARD_SIZE):
+    """Data URI for a card image: the cached thumbnail, or the original file without Pillow."""
+    if Image is not None and cache_dir is not None:
+        path, mime = thumbnail_path(src, cache_dir, size), MIME
+    else:
+        path, mime = src, _mime_for(src)
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"data:{mime};base64,{encoded}"
@@ -1,115 +1,250 @@
-from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+import asyncio
+import functools
+import json
+import queue
+import time
 
-class Agent:
-    def __init__(self, medical_report=None, role=None, extra_info=None):
-        self.medical_report = medical_report
-        self.role = role
-        self.extra_info = extra_info
-        # Initialize the prompt based on role and extra info
-        self.prompt_template = self.create_prompt_template()
-        # Initialize the model (using GPT-4 OpenAI)
-        self.model = ChatOpenAI(temperature=0, model="gpt-4o")
-
-    def create_prompt_template(self):
-        if self.role == "MultidisciplinaryTeam":
-            template = f"""
-Act as a multidisciplinary team of healthcare professionals.
-You will receive medical reports from the following specialties:
-- Cardiologist
-- Psychologist
-- Pulmonologist
-- Dermatologist
-- Neurologist
-- Gastroenterologist
-- Endocrinologist
-- Orthopedist
-- Nephrologist
-- Oncologist
+from langchain_core.prompts import PromptTemplate
 
-Task: Review these reports, analyze them comprehensively, and provide a bullet-point list of potential health issues. For each issue, indicate:
-  - The specialty (or specialties) that raised the concern.
-  - A brief explanation of the findings.
-  - Recommended diagnostic follow-ups.
-  - Suggested treatment options (such as medications, lifestyle modifications, surgical interventions, or other therapies) when applicable.
+from Utils import Config
+from Utils.Cache import digest, result_cache
+from Utils.Models import shared_model, submit_async
 
-Cardiologist Report: {self.extra_info.get('cardiologist_report', '')}
-Psychologist Report: {self.extra_info.get('psychologist_report', '')}
-Pulmonologist Report: {self.extra_info.get('pulmonologist_report', '')}
-Dermatologist Report: {self.extra_info.get('dermatologist_report', '')}
-Neurologist Report: {self.extra_info.get('neurologist_report', '')}
-Gastroenterologist Report: {self.extra_info.get('gastroenterologist_report', '')}
-Endocrinologist Report: {self.extra_info.get('endocrinologist_report', '')}
-Orthopedist Report: {self.extra_info.get('orthopedist_report', '')}
-Nephrologist Report: {self.extra_info.get('nephrologist_report', '')}
-Oncologist Report: {self.extra_info.get('oncologist_report', '')}
-            """
-        else:
-            templates = {
-                "Cardiologist": """
+SPECIALIST_TEMPLATES = {
+    "Cardiologist": """
 Act as a cardiologist. You will receive a patient's medical report.
 Task: Review the cardiac workup (ECG, blood tests, echocardiogram, etc.), identify potential cardiac issues (such as arrhythmias, structural abnormalities, or ischemic changes), and recommend further diagnostic tests and treatment options (medications, lifestyle modifications, or interventional procedures) where applicable.
 Medical Report: {medical_report}
-                """,
-                "Psychologist": """
+    """,
+    "Psychologist": """
 Act as a psychologist. You will receive a patient's medical report.
 Task: Analyze the report to identify potential mental health issues (such as anxiety, depression, trauma, etc.) and recommend appropriate interventions, including counseling, psychotherapy, or pharmacotherapy.
 Patient's Report: {medical_report}
-                """,
-                "Pulmonologist": """
+    """,
+    "Pulmonologist": """
 Act as a pulmonologist. You will receive a patient's medical report.
 Task: Evaluate the report for respiratory issues such as asthma, COPD, lung infections, or other conditions, and suggest further diagnostic steps and treatment options (inhalers, medications, pulmonary rehabilitation, etc.) as needed.
 Patient's Report: {medical_report}
-                """,
-                "Dermatologist": """
+    """,
+    "Dermatologist": """
 Act as a dermatologist. You will receive a patient's medical report.
 Task: Review the report for skin conditions such as eczema, psoriasis, acne, or other dermatological issues, and recommend further evaluation and treatment options (topical therapies, systemic medications, etc.).
 Patient's Report: {medical_report}
-                """,
-                "Neurologist": """
+    """,
+    "Neurologist": """
 Act as a neurologist. You will receive a patient's medical report.
 Task: Analyze the report for neurological issues such as migraines, seizures, neuropathy, or other conditions, and recommend further evaluations and treatment options (medications, lifestyle adjustments, or other therapies) as appropriate.
 Patient's Report: {medical_report}
-                """,
-                "Gastroenterologist": """
+    """,
+    "Gastroenterologist": """
 Act as a gastroenterologist. You will receive a patient's medical report.
 Task: Evaluate the report for gastrointestinal issues such as GERD, IBS, gastritis, or other conditions, and suggest further diagnostic tests and treatment options (dietary changes, medications, endoscopic procedures, etc.) when needed.
 Patient's Report: {medical_report}
-                """,
-                "Endocrinologist": """
+    """,
+    "Endocrinologist": """
 Act as an endocrinologist. You will receive a patient's medical report.
 Task: Review the report for endocrine and metabolic issues such as diabetes, thyroid disorders, or hormonal imbalances, and recommend further testing and management options (medications, lifestyle changes, or other therapies) as required.
 Patient's Report: {medical_report}
-                """,
-                "Orthopedist": """
+    """,
+    "Orthopedist": """
 Act as an orthopedist. You will receive a patient's medical report.
 Task: Analyze the report for musculoskeletal issues such as joint pain, fractures, arthritis, or other orthopedic conditions, and suggest further evaluation and treatment options (physiotherapy, medications, surgical interventions, etc.) when appropriate.
 Patient's Report: {medical_report}
-                """,
-                "Nephrologist": """
+    """,
+    "Nephrologist": """
 Act as a nephrologist. You will receive a patient's medical report.
 Task: Evaluate the report for kidney-related issues such as chronic kidney disease, electrolyte imbalances, or other renal conditions, and recommend further diagnostic tests and treatment options (medications, dietary modifications, or other therapies) as needed.
 Patient's Report: {medical_report}
-                """,
-                "Oncologist": """
+    """,
+    "Oncologist": """
 Act as an oncologist. You will receive a patient's medical report.
 Task: Review the report for any indications of cancer or precancerous conditions. Diagnose accurately and, if a malignancy is detected or suspected, suggest appropriate diagnostic follow-ups and treatment options, including surgery, chemotherapy, radiotherapy, targeted therapies, or immunotherapy.
 Patient's Report: {medical_report}
-                """
-            }
-            template = templates[self.role]
-        return PromptTemplate.from_template(template)
-    
+    """
+}
+
+SPECIALTIES = tuple(SPECIALIST_TEMPLATES)
+
+
+def _task(template):
+    return next(line for line in template.splitlines() if line.startswith("Task:"))[len("Task: "):]
+
+
+def panel_template(roles):
+    """One call for several specialties: the same tasks, answered as a JSON object keyed by specialty."""
+    return (
+        "\nAct as a panel of the following specialists, all reviewing the same patient's medical report:\n"
+        + "".join(f"- {role}: {_task(SPECIALIST_TEMPLATES[role])}\n" for role in roles)
+        + "\nReturn a JSON object with exactly these keys: " + ", ".join(f'"{role}"' for role in roles) + ". "
+        "Each value is that specialist's assessment as a Markdown string, as complete as if the specialist "
+        "had been consulted alone. If the report gives a specialist nothing to review, say so briefly.\n"
+        "Patient's Report: {medical_report}\n"
+    )
+
+
+PANEL_TEMPLATE = panel_template(SPECIALTIES)
+
+TEAM_TEMPLATE = """
+Act as a multidisciplinary team of healthcare professionals.
+You will receive medical reports from the following specialties:
+- Cardiologist
+- Psychologist
+- Pulmonologist
+- Dermatologist
+- Neurologist
+- Gastroenterologist
+- Endocrinologist
+- Orthopedist
+- Nephrologist
+- Oncologist
+
+Task: Review these reports, analyze them comprehensively, and provide a bullet-point list of potential health issues. For each issue, indicate:
+  - The specialty (or specialties) that raised the concern.
+  - A brief explanation of the findings.
+  - Recommended diagnostic follow-ups.
+  - Suggested treatment options (such as medications, lifestyle modifications, surgical interventions, or other therapies) when applicable.
+
+Cardiologist Report: {cardiologist_report}
+Psychologist Report: {psychologist_report}
+Pulmonologist Report: {pulmonologist_report}
+Dermatologist Report: {dermatologist_report}
+Neurologist Report: {neurologist_report}
+Gastroenterologist Report: {gastroenterologist_report}
+Endocrinologist Report: {endocrinologist_report}
+Orthopedist Report: {orthopedist_report}
+Nephrologist Report: {nephrologist_report}
+Oncologist Report: {oncologist_report}
+"""
+
+# Prompts are compiled once, not per agent
+SPECIALIST_PROMPTS = {role: PromptTemplate.from_template(template) for role, template in SPECIALIST_TEMPLATES.items()}
+TEAM_PROMPT = PromptTemplate.from_template(TEAM_TEMPLATE)
+
+
+@functools.lru_cache(maxsize=None)
+def panel_prompt(roles):
+    return PromptTemplate.from_template(panel_template(roles))
+
+
+class Agent:
+    def __init__(self, medical_report=None, role=None, extra_info=None):
+        self.medical_report = medical_report
+        self.role = role
+        self.extra_info = extra_info
+        # Token usage of the last call, if the model reports it
+        self.usage = None
+        # Whether the last output came from the result cache
+        self.cached = False
+        # Initialize the prompt based on role
+        self.prompt_template = self.create_prompt_template()
+        # The model (GPT-4o by default) and its connections are shared by all agents
+        self.model = shared_model()
+
+    def create_prompt_template(self):
+        if self.role == "MultidisciplinaryTeam":
+            return TEAM_PROMPT
+        if self.role == "SpecialistPanel":
+            return panel_prompt(self.roles)
+        return SPECIALIST_PROMPTS[self.role]
+
+    def cache_key(self):
+        """Report (or specialist reports) hash, role, prompt version and model, hashed together."""
+        inputs = self.medical_report if self.extra_info is None else json.dumps(self.extra_info, sort_keys=True)
+        return result_cache.key(self.role, Config.MODEL, digest(self.prompt_template.template)[:12], inputs or "")
+
+    def _cached(self):
+        key = self.cache_key()
+        output = result_cache.get(key)
+        self.cached = output is not None
+        if self.cached:
+            print(f"{self.role} served from cache")
+        return key, output
+
+    def _cacheable(self, output):
+        """Whether ``output`` may be stored; subclasses reject outputs they can't use."""
+        return True
+
+    def _store(self, key, output):
+        if output is not None and self._cacheable(output):
+            result_cache.put(key, output, role=self.role, model=Config.MODEL)
+
     def run(self):
+        key, output = self._cached()
+        if self.cached:
+            return output
         print(f"{self.role} is running...")
-        prompt = self.prompt_template.format(medical_report=self.medical_report)
+        prompt = self.prompt_template.format(medical_report=self.medical_report, **(self.extra_info or {}))
         try:
             response = self.model.invoke(prompt)
+            self.usage = response.usage_metadata
+            self._store(key, response.content)
+            return response.content
+        except Exception as e:
+            print("Error occurred:", e)
+            return None
+
+    async def arun(self):
+        key, output = self._cached()
+        if self.cached:
+            return output
+        print(f"{self.role} is running...")
+        prompt = self.prompt_template.format(medical_report=self.medical_report, **(self.extra_info or {}))
+        try:
+            response = await self.model.ainvoke(prompt)
+            self.usage = response.usage_metadata
+            self._store(key, response.content)
             return response.content
         except Exception as e:
             print("Error occurred:", e)
             return None
 
+
+async def run_agents(agents, max_concurrency=10, timeout=90, on_result=None):
+    """Runs ``{name: agent}`` concurrently and returns ``{name: (response, seconds, status)}``.
+
+    At most ``max_concurrency`` agents call the model at once and each one gets ``timeout``
+    seconds. ``on_result(name, response, seconds, status)`` is called as soon as each agent
+    finishes; status is "ok", "cached", "error" or "timeout" and the response is None for
+    the last two.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(name, agent):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(agent.arun(), timeout)
+                status = ("cached" if agent.cached else "ok") if response is not None else "error"
+            except asyncio.TimeoutError:
+                print(f"{name} timed out after {timeout:.0f}s")
+                response, status = None, "timeout"
+            return name, response, time.perf_counter() - start, status
+
+    results = {}
+    for next_done in asyncio.as_completed([run_one(name, agent) for name, agent in agents.items()]):
+        name, response, seconds, status = await next_done
+        results[name] = (response, seconds, status)
+        if on_result is not None:
+            on_result(name, response, seconds, status)
+    return results
+
+
+def iter_agents(agents, max_concurrency=10, timeout=90):
+    """``run_agents`` on the shared event loop, yielding ``(name, response, seconds, status)``
+    in the calling thread as each agent finishes (e.g. for Streamlit to render it)."""
+    results = queue.Queue()
+    future = submit_async(run_agents(agents, max_concurrency, timeout, on_result=lambda *result: results.put(result)))
+    for _ in agents:
+        while True:
+            try:
+                yield results.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if future.done():
+                    future.result()  # raises whatever stopped run_agents
+    future.result()
+
+
 # Specialized agent classes for each medical specialty
 class Cardiologist(Agent):
     def __init__(self, medical_report):
@@ -151,6 +286,51 @@ class Oncologist(Agent):
     def __init__(self, medical_report):
         super().__init__(medical_report, "Oncologist")
 
+class SpecialistPanel(Agent):
+    """The assessments of ``roles`` (all ten by default) from one call, as ``{specialty: report}``.
+
+    The report is sent once instead of once per specialist; the result can be passed
+    straight to ``MultidisciplinaryTeam.from_reports``.
+    """
+
+    def __init__(self, medical_report, roles=SPECIALTIES):
+        self.roles = tuple(roles)
+        super().__init__(medical_report, "SpecialistPanel")
+        self.model = self.model.bind(response_format={"type": "json_object"})
+
+    def run(self):
+        return self.parse(super().run())
+
+    async def arun(self):
+        return self.parse(await super().arun())
+
+    def _cacheable(self, output):
+        try:
+            self._decode(output)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _decode(content):
+        reports = json.loads(content)
+        if not isinstance(reports, dict):
+            raise ValueError(f"expected a JSON object, got {type(reports).__name__}")
+        return reports
+
+    def parse(self, content):
+        if content is None:
+            return None
+        try:
+            reports = self._decode(content)
+        except ValueError as e:
+            print("Could not parse the panel's reports:", e)
+            return None
+        return {
+            role: value if isinstance(value, str) else json.dumps(value, indent=2)
+            for role, value in ((role, reports.get(role, "")) for role in self.roles)
+        }
+
 class MultidisciplinaryTeam(Agent):
     def __init__(self, cardiologist_report, psychologist_report, pulmonologist_report, dermatologist_report, neurologist_report, gastroenterologist_report, endocrinologist_report, orthopedist_report, nephrologist_report, oncologist_report):
         extra_info = {
@@ -166,3 +346,8 @@ class MultidisciplinaryTeam(Agent):
             "oncologist_report": oncologist_report
         }
         super().__init__(role="MultidisciplinaryTeam", extra_info=extra_info)
+
+    @classmethod
+    def from_reports(cls, reports):
+        """The team reviewing ``{specialty: report}``, from the specialists or a ``SpecialistPanel``."""
+        return cls(**{f"{role.lower()}_report": reports.get(role) or "" for role in SPECIALTIES})
@@ -0,0 +1,105 @@
+"""Content-addressed disk cache of agent outputs.
+
+An output is stored under the hash of what produced it: the agent's role, the model,
+the prompt version (a hash of the prompt template, so editing a prompt invalidates its
+outputs) and the hash of its inputs - the medical report for a specialist, the
+specialist reports for the team. Re-analysing an unchanged report is served from disk,
+and the team only runs again when one of its inputs changed.
+
+Each entry is a small JSON file written atomically. The directory is kept under
+``max_bytes`` by deleting the least recently used entries (hits refresh an entry's
+modification time).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from Utils import Config
+
+
+def digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def key(self, role, model, prompt_version, inputs):
+        return digest("\0".join((role, model, prompt_version, digest(inputs))))
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """The cached output for ``key``, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry["output"]
+
+    def put(self, key, output, **info):
+        """Stores ``output`` under ``key``; ``info`` (role, model, ...) is kept alongside it."""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"output": output, "created": time.time(), **info}, f)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    try:
+                        stat = os.stat(os.path.join(self.directory, name))
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            for _, size, name in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                total -= size
+                self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+result_cache = ResultCache(Config.CACHE_DIR, int(Config.CACHE_MAX_MB * 2 ** 20))
@@ -0,0 +1,37 @@
+"""Medical diagnostics agent settings, read once from the environment (or a ``.env`` file)."""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Chat model used by every agent.
+MODEL = os.getenv("MEDICAL_MODEL", "gpt-4o")
+# HTTP connections to the model API shared by all agents, and seconds an idle one is kept.
+MODEL_MAX_CONNECTIONS = int(os.getenv("MEDICAL_MODEL_MAX_CONNECTIONS", "10"))
+MODEL_KEEPALIVE = float(os.getenv("MEDICAL_MODEL_KEEPALIVE", "60"))
+
+# "fanout": one call per specialist. "single": one call returning every specialty's
+# assessment as JSON, so the report's tokens are sent once.
+ANALYSIS_MODE = os.getenv("MEDICAL_ANALYSIS_MODE", "fanout").strip().lower()
+
+# Specialists calling the model at once.
+SPECIALIST_CONCURRENCY = int(os.getenv("MEDICAL_SPECIALIST_CONCURRENCY", "10"))
+# Seconds each specialist (or the single panel call) gets before its report is given up on.
+SPECIALIST_TIMEOUT = float(os.getenv("MEDICAL_SPECIALIST_TIMEOUT", "90"))
+# Keyword triage before the specialists: only specialties whose lexicon matches at least
+# TRIAGE_THRESHOLD distinct terms in the report are consulted.
+TRIAGE = _flag("MEDICAL_TRIAGE", True)
+TRIAGE_THRESHOLD = int(os.getenv("MEDICAL_TRIAGE_THRESHOLD", "2"))
+# Disk cache of specialist and team outputs, keyed by report, role, prompt and model;
+# least recently used entries are deleted beyond CACHE_MAX_MB (0 disables the cache).
+CACHE_DIR = os.getenv("MEDICAL_CACHE_DIR", ".medical_cache")
+CACHE_MAX_MB = float(os.getenv("MEDICAL_CACHE_MAX_MB", "50"))
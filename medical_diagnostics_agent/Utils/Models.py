@@ -0,0 +1,55 @@
+"""The chat model shared by every agent, and the event loop its async calls run on.
+
+Agents used to build their own ``ChatOpenAI``, each with new HTTP clients, for every
+report. ``shared_model`` builds one per process on pooled httpx clients that keep their
+connections alive between reports, with at most ``MEDICAL_MODEL_MAX_CONNECTIONS``
+requests in flight. Pooled async connections belong to the event loop that opened
+them, so async calls go through ``submit_async``/``run_async`` on one background loop
+instead of a fresh ``asyncio.run`` per report.
+"""
+import asyncio
+import threading
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from Utils import Config
+
+_lock = threading.Lock()
+_model = None
+_loop = None
+
+
+def shared_model():
+    global _model
+    with _lock:
+        if _model is None:
+            limits = httpx.Limits(
+                max_connections=Config.MODEL_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.MODEL_MAX_CONNECTIONS,
+                keepalive_expiry=Config.MODEL_KEEPALIVE,
+            )
+            _model = ChatOpenAI(
+                temperature=0, model=Config.MODEL,
+                http_client=httpx.Client(limits=limits), http_async_client=httpx.AsyncClient(limits=limits),
+            )
+        return _model
+
+
+def _event_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="agent-loop", daemon=True).start()
+        return _loop
+
+
+def submit_async(coro):
+    """Schedules ``coro`` on the shared event loop; returns a ``concurrent.futures.Future``."""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop())
+
+
+def run_async(coro):
+    """Runs ``coro`` on the shared event loop and returns its result."""
+    return submit_async(coro).result()
@@ -0,0 +1,91 @@
+"""Cheap relevance triage of a medical report before the specialists are called.
+
+Each specialty has a lexicon of findings, tests, drugs and organ terms; a term matches
+at a word start, so "arrhythmi" covers "arrhythmia" and "arrhythmias". A specialty's
+score is the number of distinct terms found in the report and only specialties scoring
+at least ``threshold`` are sent to the model. The matcher errs on the side of running a
+specialist: a negated finding ("denies chest pain") still counts, and a report that
+indicates no specialty at all is sent to every one of them.
+"""
+import re
+
+from Utils.Agents import SPECIALTIES
+
+LEXICON = {
+    "Cardiologist": [
+        "cardi", "heart", "chest pain", "chest discomfort", "palpitation", "angina", "arrhythmi", "tachycardi",
+        "bradycardi", "atrial", "ventricular", "ecg", "ekg", "electrocardiogram", "echocardiogram", "holter",
+        "troponin", "ck-mb", "coronary", "ischemi", "myocardial", "hypertension", "blood pressure",
+        "hyperlipidemi", "cholesterol", "statin", "atorvastatin", "simvastatin", "lisinopril", "murmur",
+        "stress test", "angiograph",
+    ],
+    "Psychologist": [
+        "anxiety", "anxious", "depress", "panic", "stress", "worry", "insomnia", "mood", "trauma", "ptsd",
+        "suicid", "psychiatr", "mental health", "counseling", "psychotherapy", "cognitive behavioral",
+        "cognitive-behavioral", "cbt", "ssri", "sertraline", "fluoxetine", "lorazepam", "benzodiazepine",
+        "restless", "burnout", "bipolar", "adhd",
+    ],
+    "Pulmonologist": [
+        "lung", "pulmonary", "respirat", "breath", "dyspnea", "cough", "wheez", "asthma", "copd", "emphysema",
+        "bronch", "pneumon", "spirometr", "fev1", "inhaler", "albuterol", "oxygen saturation", "hypoxi",
+        "chest x-ray", "chest ct", "hemoptysis", "smok", "pack-year",
+    ],
+    "Dermatologist": [
+        "skin", "rash", "dermat", "eczema", "psoriasis", "acne", "pruritic", "prurit", "itch", "erythema",
+        "lesion", "mole", "melanoma", "urticaria", "hives", "blister", "topical",
+    ],
+    "Neurologist": [
+        "neuro", "headache", "migraine", "seizure", "epilep", "dizz", "vertigo", "numb", "tingling",
+        "neuropath", "stroke", "tremor", "syncope", "faint", "memory", "concussion", "mri brain", "brain",
+        "eeg", "focal deficit", "paresthesi",
+    ],
+    "Gastroenterologist": [
+        "abdominal", "gastr", "gerd", "reflux", "heartburn", "nausea", "vomit", "diarrhea", "constipation",
+        "ibs", "bowel", "colon", "liver", "hepat", "transaminase", "gallstone", "cholecyst", "cholelithiasis",
+        "pancrea", "endoscop", "colonoscop", "omeprazole", "proton pump", "ppi", "dyspepsia", "stool",
+    ],
+    "Endocrinologist": [
+        "diabet", "glucose", "hba1c", "insulin", "metformin", "thyroid", "levothyroxine", "tsh", "polyuria",
+        "polydipsia", "thirst", "weight loss", "weight gain", "obes", "metabolic", "endocrin", "hormon",
+        "cortisol", "adrenal", "pituitar", "osteoporosis",
+    ],
+    "Orthopedist": [
+        "joint", "knee", "hip", "shoulder", "back pain", "spine", "fracture", "arthritis", "osteoarthritis",
+        "rheumat", "musculoskeletal", "orthop", "tendon", "ligament", "sprain", "stiffness", "osteophyte",
+        "x-ray", "physiotherap", "nsaid", "bone",
+    ],
+    "Nephrologist": [
+        "kidney", "renal", "nephr", "creatinine", "bun", "urea", "egfr", "urine", "urinalysis", "proteinuria",
+        "hematuria", "dialysis", "electrolyte", "potassium", "sodium", "edema", "swelling in the lower",
+        "kidney stone",
+    ],
+    "Oncologist": [
+        "cancer", "tumor", "tumour", "malignan", "oncolog", "mass", "nodule", "biopsy", "metasta", "lymphoma",
+        "leukemia", "carcinoma", "chemotherap", "radiotherap", "night sweats", "unexplained weight loss",
+        "weight loss", "smok", "pack-year", "lymph node", "hemoptysis",
+    ],
+}
+
+# What the team is told about a specialty triage skipped
+NOT_INDICATED = "Not indicated: triage found no relevant findings in the report, so this specialty was not consulted."
+
+_PATTERNS = {
+    role: [(term, re.compile(r"\b" + re.escape(term), re.IGNORECASE)) for term in terms]
+    for role, terms in LEXICON.items()
+}
+
+
+def score_report(report):
+    """``{specialty: [lexicon terms found in report]}``."""
+    return {role: [term for term, pattern in _PATTERNS[role] if pattern.search(report)] for role in SPECIALTIES}
+
+
+def triage(report, threshold=2):
+    """``(indicated, skipped, matches)``: the specialties to call, the ones to skip and
+    the terms each one matched."""
+    matches = score_report(report)
+    indicated = [role for role in SPECIALTIES if len(matches[role]) >= threshold]
+    if not indicated:
+        indicated = list(SPECIALTIES)
+    skipped = [role for role in SPECIALTIES if role not in indicated]
+    return indicated, skipped, matches
@@ -3,15 +3,31 @@ from Utils.Agents import (
     Cardiologist, Psychologist, Pulmonologist,
     Dermatologist, Neurologist, Gastroenterologist,
     Endocrinologist, Orthopedist, Nephrologist, Oncologist,
-    MultidisciplinaryTeam
+    MultidisciplinaryTeam, SpecialistPanel, SPECIALTIES, iter_agents
 )
+from Utils import Config
+from Utils.Cache import result_cache
+from Utils.Triage import NOT_INDICATED, triage
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
 
+SPECIALISTS = {
+    "Cardiologist": Cardiologist,
+    "Psychologist": Psychologist,
+    "Pulmonologist": Pulmonologist,
+    "Dermatologist": Dermatologist,
+    "Neurologist": Neurologist,
+    "Gastroenterologist": Gastroenterologist,
+    "Endocrinologist": Endocrinologist,
+    "Orthopedist": Orthopedist,
+    "Nephrologist": Nephrologist,
+    "Oncologist": Oncologist
+}
+
 # Set up the page configuration with title and icon
 st.set_page_config(page_title="Advanced AI Healthcare Agent", page_icon=":hospital:")
 
@@ -27,7 +43,7 @@ with st.sidebar:
     )
     st.markdown("## Features")
     st.write("- **Multi-Specialist Analysis:** Individual analysis from various specialized healthcare agents.")
-    st.write("- **Concurrent Processing:** Agents run concurrently for faster results.")
+    st.write("- **Concurrent Processing:** Agents run concurrently and each report is shown as soon as it is ready.")
     st.write("- **Holistic Diagnosis:** Combines expert opinions for a comprehensive final diagnosis.")
     st.write("- **Downloadable Report:** Save your final diagnosis for future reference.")
     st.markdown("## How to Use")
@@ -54,46 +70,64 @@ if uploaded_file is not None:
     if st.button("Analyze Report"):
         st.info("Processing the medical report. Please wait...")
         
-        # Initialize all specialized agents
-        agents = {
-            "Cardiologist": Cardiologist(medical_report),
-            "Psychologist": Psychologist(medical_report),
-            "Pulmonologist": Pulmonologist(medical_report),
-            "Dermatologist": Dermatologist(medical_report),
-            "Neurologist": Neurologist(medical_report),
-            "Gastroenterologist": Gastroenterologist(medical_report),
-            "Endocrinologist": Endocrinologist(medical_report),
-            "Orthopedist": Orthopedist(medical_report),
-            "Nephrologist": Nephrologist(medical_report),
-            "Oncologist": Oncologist(medical_report)
-        }
-
-        responses = {}
-        def get_response(agent_name, agent):
-            response = agent.run()
-            return agent_name, response
-
-        # Run agents concurrently
-        with ThreadPoolExecutor() as executor:
-            futures = {executor.submit(get_response, name, agent): name for name, agent in agents.items()}
-            for future in as_completed(futures):
-                agent_name, response = future.result()
-                responses[agent_name] = response
+        # Only consult the specialties the report gives something to review
+        if Config.TRIAGE:
+            indicated, skipped, matches = triage(medical_report, threshold=Config.TRIAGE_THRESHOLD)
+        else:
+            indicated, skipped, matches = list(SPECIALTIES), [], {}
+        if skipped:
+            saved = f"{len(skipped)} model call(s) saved" if Config.ANALYSIS_MODE != "single" else "the panel call covers only those"
+            st.info(f"Triage: {len(indicated)} of {len(SPECIALTIES)} specialties indicated, {saved}. Not indicated: {', '.join(skipped)}.")
+            print(f"Triage: consulting {', '.join(indicated)}; skipping {', '.join(skipped)}")
+        if matches:
+            with st.expander("Triage decision"):
+                st.table([
+                    {"Specialty": name, "Matches": len(matches[name]), "Terms": ", ".join(matches[name]),
+                     "Decision": "consulted" if name in indicated else "not indicated"}
+                    for name in SPECIALTIES
+                ])
+
+        responses = {name: NOT_INDICATED for name in skipped}
+        timings = []
+        progress = st.progress(0.0, text=f"0/{len(indicated)} specialists done")
+
+        def show_report(agent_name, response, seconds, status):
+            responses[agent_name] = response
+            timings.append({"Agent": agent_name, "Seconds": round(seconds, 2), "Status": status})
+            progress.progress(len(timings) / len(indicated), text=f"{len(timings)}/{len(indicated)} specialists done")
+            label = f"{agent_name} ({seconds:.1f}s)" if status == "ok" else f"{agent_name} ({status})"
+            with st.expander(label):
+                st.markdown(response or "No report.")
+
+        def show_panel(agent_name, reports, seconds, status):
+            timings.append({"Agent": agent_name, "Seconds": round(seconds, 2), "Status": status})
+            for name in indicated:
+                responses[name] = reports[name] if reports else None
+                with st.expander(name if status == "ok" else f"{name} ({status})"):
+                    st.markdown(responses[name] or "No report.")
+            progress.progress(1.0, text=f"{len(indicated)} specialists done in one call ({seconds:.1f}s)")
+
+        if Config.ANALYSIS_MODE == "single":
+            # One call returns every specialty's assessment
+            for result in iter_agents({"SpecialistPanel": SpecialistPanel(medical_report, roles=indicated)},
+                                      timeout=Config.SPECIALIST_TIMEOUT):
+                show_panel(*result)
+        else:
+            # Initialize the indicated specialized agents
+            agents = {name: SPECIALISTS[name](medical_report) for name in indicated}
+
+            # Run agents concurrently, rendering each report as soon as it completes
+            for result in iter_agents(agents, max_concurrency=Config.SPECIALIST_CONCURRENCY,
+                                      timeout=Config.SPECIALIST_TIMEOUT):
+                show_report(*result)
 
         # Run the multidisciplinary team analysis to combine results
-        team_agent = MultidisciplinaryTeam(
-            cardiologist_report=responses.get("Cardiologist", ""),
-            psychologist_report=responses.get("Psychologist", ""),
-            pulmonologist_report=responses.get("Pulmonologist", ""),
-            dermatologist_report=responses.get("Dermatologist", ""),
-            neurologist_report=responses.get("Neurologist", ""),
-            gastroenterologist_report=responses.get("Gastroenterologist", ""),
-            endocrinologist_report=responses.get("Endocrinologist", ""),
-            orthopedist_report=responses.get("Orthopedist", ""),
-            nephrologist_report=responses.get("Nephrologist", ""),
-            oncologist_report=responses.get("Oncologist", "")
-        )
+        team_agent = MultidisciplinaryTeam.from_reports(responses)
+        start = time.perf_counter()
         final_diagnosis = team_agent.run()
+        team_status = ("cached" if team_agent.cached else "ok") if final_diagnosis is not None else "error"
+        timings.append({"Agent": "MultidisciplinaryTeam", "Seconds": round(time.perf_counter() - start, 2), "Status": team_status})
+        print("Agent timings:", ", ".join(f"{t['Agent']} {t['Seconds']}s ({t['Status']})" for t in timings))
 
         # Display the final diagnosis in a styled box with emojis
         st.markdown(
@@ -111,3 +145,13 @@ if uploaded_file is not None:
         with open(results_path, "r") as file:
             result_data = file.read()
         st.download_button("Download Final Diagnosis", result_data, file_name="final_diagnosis.txt")
+
+        if result_cache.enabled:
+            hits = sum(t["Status"] == "cached" for t in timings)
+            st.caption(
+                f"Result cache: {hits} hit(s), {len(timings) - hits} miss(es) this run; "
+                f"{result_cache.stats()['hit_rate']:.0%} of lookups hit since start-up."
+            )
+
+        with st.expander("Agent timings"):
+            st.table(sorted(timings, key=lambda t: t["Seconds"], reverse=True))
@@ -0,0 +1,87 @@
+"""Per-report setup cost of the agents: construction, prompt compilation and connections.
+
+Compares building the eleven agents of one report the old way (a new ``ChatOpenAI``
+with its own HTTP clients and freshly parsed prompt templates per agent) with the
+shared model and precompiled prompts now used by ``Utils.Agents``. With ``--live``
+it also times small sequential requests on a new HTTP client each (connection and TLS
+setup every time) against the shared, kept-alive pool; this needs ``OPENAI_API_KEY``
+(or ``OPENAI_BASE_URL`` pointing at a compatible server). Run from
+``medical_diagnostics_agent/``::
+
+    python benchmarks/bench_agent_setup.py [--reports 50] [--live --calls 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx  # noqa: E402
+from langchain_core.prompts import PromptTemplate  # noqa: E402
+from langchain_openai import ChatOpenAI  # noqa: E402
+
+from Utils import Config  # noqa: E402
+from Utils.Agents import SPECIALIST_TEMPLATES, SPECIALTIES, TEAM_TEMPLATE, Agent, MultidisciplinaryTeam  # noqa: E402
+from Utils.Models import shared_model  # noqa: E402
+
+REPORT = "Patient reports chest pain on exertion. ECG: ST depressions in V4-V6."
+
+
+def old_setup(report):
+    """What every report used to pay: eleven models, eleven HTTP client pairs, eleven parses."""
+    for role in SPECIALTIES:
+        ChatOpenAI(temperature=0, model=Config.MODEL, http_client=httpx.Client(), http_async_client=httpx.AsyncClient())
+        PromptTemplate.from_template(SPECIALIST_TEMPLATES[role]).format(medical_report=report)
+    ChatOpenAI(temperature=0, model=Config.MODEL, http_client=httpx.Client(), http_async_client=httpx.AsyncClient())
+    # The team prompt was an f-string with the reports already in it
+    PromptTemplate.from_template(TEAM_TEMPLATE.format(**{f"{role.lower()}_report": "" for role in SPECIALTIES}))
+
+
+def new_setup(report):
+    for role in SPECIALTIES:
+        Agent(report, role).prompt_template.format(medical_report=report)
+    team = MultidisciplinaryTeam.from_reports({})
+    team.prompt_template.format(medical_report=None, **team.extra_info)
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return 1000 * times[len(times) // 2], 1000 * sum(times) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=50)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+    if not args.live:
+        # Constructing a client needs a key, but nothing is sent
+        os.environ.setdefault("OPENAI_API_KEY", "sk-construction-only")
+
+    shared_model()  # built once per process, like the first report after start-up
+    print(f"{'setup per report':<28} {'p50 ms':>8} {'mean ms':>8}")
+    for name, fn in (("new client per agent", old_setup), ("shared model, compiled", new_setup)):
+        p50, mean = timed(lambda: fn(REPORT), args.reports)
+        print(f"{name:<28} {p50:>8.2f} {mean:>8.2f}")
+
+    if args.live:
+        def cold():
+            ChatOpenAI(temperature=0, model=Config.MODEL, max_tokens=1, http_client=httpx.Client()).invoke("Say OK.")
+
+        warm_model = shared_model().bind(max_tokens=1)
+        warm_model.invoke("Say OK.")  # open the pooled connection
+        print(f"\n{'request, 1 output token':<28} {'p50 ms':>8} {'mean ms':>8}")
+        for name, fn in (("new HTTP client", cold), ("shared keep-alive pool", lambda: warm_model.invoke("Say OK."))):
+            p50, mean = timed(fn, args.calls)
+            print(f"{name:<28} {p50:>8.1f} {mean:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
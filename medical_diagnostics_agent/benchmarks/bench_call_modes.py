@@ -0,0 +1,125 @@
+"""Tokens, cost and wall time of the fan-out and single-call analysis modes.
+
+Analyses each report both ways - ten specialist calls plus the team, then one
+``SpecialistPanel`` call plus the team - and adds up the token usage reported by the
+API. The result cache is bypassed, so every run makes the calls it measures. Needs
+``OPENAI_API_KEY``; with ``--offline`` no calls are made and only the prompt tokens
+each mode sends for the specialist stage are counted. Run from
+``medical_diagnostics_agent/``::
+
+    python benchmarks/bench_call_modes.py [--reports "Medical Reports/Cardiology-Focused Report.txt" ...] [--offline]
+"""
+import argparse
+import asyncio
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.prompts import PromptTemplate  # noqa: E402
+
+from Utils.Agents import (  # noqa: E402
+    PANEL_TEMPLATE, SPECIALIST_TEMPLATES, SPECIALTIES, Agent, MultidisciplinaryTeam, SpecialistPanel, run_agents,
+)
+from Utils.Cache import result_cache  # noqa: E402
+from Utils.Models import run_async  # noqa: E402
+
+# gpt-4o list prices, USD per million tokens
+INPUT_PRICE = 2.50
+OUTPUT_PRICE = 10.00
+
+
+def load_encoding():
+    """tiktoken's o200k_base encoding, or None without ``tiktoken`` or when it can't be loaded
+    (the encoding file is downloaded on first use)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except ImportError:
+        return None
+    except Exception as e:
+        print(f"Could not load the tiktoken encoding ({e}); estimating token counts instead")
+        return None
+
+
+def count_tokens(text, encoding):
+    """Tokens in ``text``: exact with ``encoding``, ``len(text) // 4`` without it."""
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+async def fanout(report, concurrency, timeout):
+    agents = {role: Agent(report, role) for role in SPECIALTIES}
+    results = await run_agents(agents, max_concurrency=concurrency, timeout=timeout)
+    team = MultidisciplinaryTeam.from_reports({role: result[0] for role, result in results.items()})
+    await team.arun()
+    return list(agents.values()) + [team]
+
+
+async def single(report, timeout):
+    panel = SpecialistPanel(report)
+    reports = await asyncio.wait_for(panel.arun(), timeout)
+    team = MultidisciplinaryTeam.from_reports(reports or {})
+    await team.arun()
+    return [panel, team]
+
+
+def usage(agents):
+    tokens_in = sum(agent.usage["input_tokens"] for agent in agents if agent.usage)
+    tokens_out = sum(agent.usage["output_tokens"] for agent in agents if agent.usage)
+    return tokens_in, tokens_out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", nargs="+", default=sorted(glob.glob("Medical Reports/*.txt")))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+
+    if args.offline:
+        encoding = load_encoding()
+        print("Prompt tokens counted with " + ("tiktoken (o200k_base)" if encoding else "len(text) // 4 (estimate)"))
+        print(f"{'report':<50} {'fan-out in':>10} {'single in':>10} {'saved':>6}")
+        for path in args.reports:
+            with open(path, encoding="utf-8") as f:
+                report = f.read()
+            fan_in = sum(count_tokens(PromptTemplate.from_template(template).format(medical_report=report), encoding)
+                         for template in SPECIALIST_TEMPLATES.values())
+            single_in = count_tokens(PromptTemplate.from_template(PANEL_TEMPLATE).format(medical_report=report), encoding)
+            print(f"{os.path.basename(path)[:50]:<50} {fan_in:>10} {single_in:>10} {1 - single_in / fan_in:>6.0%}")
+        return
+
+    # Cached outputs report no usage; measure the calls themselves.
+    result_cache.max_bytes = 0
+
+    print(f"{'report':<40} {'mode':<8} {'calls':>5} {'in tok':>7} {'out tok':>7} {'cost $':>7} {'wall s':>7}")
+    totals = {"fan-out": [0, 0, 0.0], "single": [0, 0, 0.0]}
+    for path in args.reports:
+        with open(path, encoding="utf-8") as f:
+            report = f.read()
+        for mode in ("fan-out", "single"):
+            start = time.perf_counter()
+            if mode == "fan-out":
+                agents = run_async(fanout(report, args.concurrency, args.timeout))
+            else:
+                agents = run_async(single(report, args.timeout))
+            wall = time.perf_counter() - start
+            tokens_in, tokens_out = usage(agents)
+            cost = (tokens_in * INPUT_PRICE + tokens_out * OUTPUT_PRICE) / 1e6
+            for i, value in enumerate((tokens_in, tokens_out, wall)):
+                totals[mode][i] += value
+            print(f"{os.path.basename(path)[:40]:<40} {mode:<8} {len(agents):>5} {tokens_in:>7} {tokens_out:>7} "
+                  f"{cost:>7.4f} {wall:>7.1f}")
+    for mode, (tokens_in, tokens_out, wall) in totals.items():
+        cost = (tokens_in * INPUT_PRICE + tokens_out * OUTPUT_PRICE) / 1e6
+        print(f"{'total':<40} {mode:<8} {'':>5} {tokens_in:>7} {tokens_out:>7} {cost:>7.4f} {wall:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
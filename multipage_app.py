@@ -0,0 +1,19 @@
+import streamlit as st
+
+from launcher import multipage
+
+# Shared process setup: agent import paths and background preload of heavy modules.
+multipage.prepare()
+agent_pages = multipage.build_pages()
+
+
+def home():
+    st.set_page_config(page_title="NexusAI", page_icon="🤖")
+    st.markdown("<h1 style='text-align:center;'>✨NexusAI✨</h1>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align:center;'>All agents are served by this single Streamlit server. Pick one below or from the sidebar.</p>", unsafe_allow_html=True)
+    for page in agent_pages:
+        st.page_link(page)
+
+
+page = st.navigation([st.Page(home, title="NexusAI", icon="✨", default=True), *agent_pages])
+page.run()